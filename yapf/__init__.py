@@ -28,6 +28,7 @@ If no filenames are specified, YAPF reads the code from stdin.
 from __future__ import print_function
 
 import argparse
+import functools
 import logging
 import os
 import sys
@@ -38,7 +39,9 @@ from yapf.yapflib import errors
 from yapf.yapflib import file_resources
 from yapf.yapflib import py3compat
 from yapf.yapflib import style
+from yapf.yapflib import verifier
 from yapf.yapflib import yapf_api
+from yapf.yapflib.warnings import warn_msg
 
 __version__ = '0.29.0'
 
@@ -52,7 +55,9 @@ def main(argv):
 
   Returns:
     Zero on successful program termination, non-zero otherwise.
-    With --diff: zero if there were no changes, non-zero otherwise.
+    With --diff, --quiet or --check: zero if there were no changes, non-zero
+    otherwise.
+    With --lint-only: zero if there were no warnings, non-zero otherwise.
 
   Raises:
     YapfError: if none of the supplied files were Python files.
@@ -80,6 +85,16 @@ def main(argv):
       '--quiet',
       action='store_true',
       help='output nothing and set return value')
+  diff_inplace_quiet_group.add_argument(
+      '--check',
+      action='store_true',
+      help=('output nothing and set return value, stopping to reformat each '
+            'file at its first change'))
+  diff_inplace_quiet_group.add_argument(
+      '--lint-only',
+      action='store_true',
+      help=('only print the style warnings, without reformatting the code; '
+            'the warnings refer to the lines of the original code'))
 
   lines_recursive_group = parser.add_mutually_exclusive_group()
   lines_recursive_group.add_argument(
@@ -122,6 +137,22 @@ def main(argv):
       action='store_true',
       help="don't search for local style definition")
   parser.add_argument('--verify', action='store_true', help=argparse.SUPPRESS)
+  parser.add_argument(
+      '--check-equivalence',
+      action='store_true',
+      help=('check that the reformatted code has the same AST as the original '
+            'code, ignoring the changes made by the configured fixers'))
+  parser.add_argument(
+      '--low-memory',
+      action='store_true',
+      help=('free the parse tree of each file before its lines are '
+            'reformatted, to use less memory on large files'))
+  parser.add_argument(
+      '--warnings-format',
+      choices=warn_msg.OUTPUT_FORMATS,
+      default='jsonl',
+      help=('format of the style warnings report, which is written to stderr '
+            'once all the files are processed (default: %(default)s)'))
   parser.add_argument(
       '-p',
       '--parallel',
@@ -155,6 +186,10 @@ def main(argv):
       option_value = style.Get(option)
       if isinstance(option_value, set) or isinstance(option_value, list):
         option_value = ', '.join(map(str, option_value))
+      elif isinstance(option_value, dict):
+        option_value = ' '.join(
+            '{}={}'.format(key, value)
+            for key, value in sorted(option_value.items()))
       print(option.lower(), '=', option_value, sep='')
     return 0
 
@@ -189,18 +224,37 @@ def main(argv):
     source = [line.rstrip() for line in original_source]
     source[0] = py3compat.removeBOM(source[0])
 
+    if args.lint_only:
+      messages = yapf_api.LintCode(
+          py3compat.unicode('\n'.join(source) + '\n'),
+          filename='<stdin>',
+          style_config=style_config,
+          lines=lines)
+      messages.show(args.warnings_format)
+      return 1 if messages else 0
+
+    warnings = []
+    output = None
+    if not args.check:
+      output = functools.partial(file_resources.WriteReformattedCode,
+                                 '<stdout>')
     try:
-      reformatted_source, _ = yapf_api.FormatCode(
+      _, changed = yapf_api.FormatCode(
           py3compat.unicode('\n'.join(source) + '\n'),
           filename='<stdin>',
           style_config=style_config,
           lines=lines,
-          verify=args.verify)
+          verify=args.verify,
+          check_equivalence=args.check_equivalence,
+          warnings=warnings,
+          low_memory=args.low_memory,
+          output=output,
+          check=args.check)
     except tokenize.TokenError as e:
       raise errors.YapfError('%s:%s' % (e.args[1][0], e.args[0]))
 
-    file_resources.WriteReformattedCode('<stdout>', reformatted_source)
-    return 0
+    warn_msg.write_report([warnings], args.warnings_format)
+    return 1 if changed and args.check else 0
 
   # Get additional exclude patterns from ignorefile
   exclude_patterns_from_ignore_file = file_resources.GetExcludePatternsForDir(
@@ -212,6 +266,17 @@ def main(argv):
   if not files:
     raise errors.YapfError('Input filenames did not match any python files')
 
+  if args.lint_only:
+    has_warnings = LintFiles(
+        files,
+        lines,
+        style_config=args.style,
+        no_local_style=args.no_local_style,
+        parallel=args.parallel,
+        verbose=args.verbose,
+        warnings_format=args.warnings_format)
+    return 1 if has_warnings else 0
+
   changed = FormatFiles(
       files,
       lines,
@@ -222,8 +287,12 @@ def main(argv):
       verify=args.verify,
       parallel=args.parallel,
       quiet=args.quiet,
-      verbose=args.verbose)
-  return 1 if changed and (args.diff or args.quiet) else 0
+      verbose=args.verbose,
+      check_equivalence=args.check_equivalence,
+      warnings_format=args.warnings_format,
+      low_memory=args.low_memory,
+      check=args.check)
+  return 1 if changed and (args.diff or args.quiet or args.check) else 0
 
 
 def FormatFiles(filenames,
@@ -235,7 +304,11 @@ def FormatFiles(filenames,
                 verify=False,
                 parallel=False,
                 quiet=False,
-                verbose=False):
+                verbose=False,
+                check_equivalence=False,
+                warnings_format='jsonl',
+                low_memory=False,
+                check=False):
   """Format a list of files.
 
   Arguments:
@@ -254,11 +327,22 @@ def FormatFiles(filenames,
     parallel: (bool) True if should format multiple files in parallel.
     quiet: (bool) True if should output nothing.
     verbose: (bool) True if should print out filenames while processing.
+    check_equivalence: (bool) True if the AST of the reformatted code should be
+      compared with the original one. The check runs in the worker that
+      formatted the file.
+    warnings_format: (string) The format of the style warnings report (see
+      warn_msg.write_report). The workers return the warnings of their files,
+      which are written in one report once all the files are formatted.
+    low_memory: (bool) True if the parse tree of each file should be freed
+      before its lines are reformatted (see yapf_api.FormatCode).
+    check: (bool) True if the files should only be checked for changes, each
+      one up to its first change (see yapf_api.FormatCode).
 
   Returns:
     True if the source code changed in any of the files being formatted.
   """
   changed = False
+  all_warnings = []
   if parallel:
     import multiprocessing  # pylint: disable=g-import-not-at-top
     import concurrent.futures  # pylint: disable=g-import-not-at-top
@@ -267,14 +351,24 @@ def FormatFiles(filenames,
       future_formats = [
           executor.submit(_FormatFile, filename, lines, style_config,
                           no_local_style, in_place, print_diff, verify, quiet,
-                          verbose) for filename in filenames
+                          verbose, check_equivalence, low_memory, check)
+          for filename in filenames
       ]
       for future in concurrent.futures.as_completed(future_formats):
-        changed |= future.result()
+        has_change, warnings = future.result()
+        changed |= has_change
+        all_warnings.append(warnings)
   else:
     for filename in filenames:
-      changed |= _FormatFile(filename, lines, style_config, no_local_style,
-                             in_place, print_diff, verify, quiet, verbose)
+      has_change, warnings = _FormatFile(filename, lines, style_config,
+                                         no_local_style, in_place, print_diff,
+                                         verify, quiet, verbose,
+                                         check_equivalence, low_memory,
+                                         check, stream=True)
+      changed |= has_change
+      all_warnings.append(warnings)
+
+  warn_msg.write_report(all_warnings, warnings_format)
   return changed
 
 
@@ -286,13 +380,31 @@ def _FormatFile(filename,
                 print_diff=False,
                 verify=False,
                 quiet=False,
-                verbose=False):
-  """Format an individual file."""
+                verbose=False,
+                check_equivalence=False,
+                low_memory=False,
+                check=False,
+                stream=False):
+  """Format an individual file.
+
+  The reformatted code is written to stdout unless in_place, print_diff, quiet
+  or check is given. With stream, it's written in chunks as soon as they're
+  formatted; the parallel workers don't stream, so that the output of the
+  files isn't mixed up.
+
+  Returns:
+    Tuple of (has_change, warnings), where warnings are the rendered style
+    warnings of the file.
+  """
   if verbose and not quiet:
     print('Reformatting %s' % filename)
   if style_config is None and not no_local_style:
     style_config = file_resources.GetDefaultStyleForDir(
         os.path.dirname(filename))
+  warnings = []
+  output = None
+  if stream and not (in_place or print_diff or quiet or check):
+    output = functools.partial(file_resources.WriteReformattedCode, filename)
   try:
     reformatted_code, encoding, has_change = yapf_api.FormatFile(
         filename,
@@ -301,16 +413,93 @@ def _FormatFile(filename,
         lines=lines,
         print_diff=print_diff,
         verify=verify,
-        logger=logging.warning)
+        logger=logging.warning,
+        check_equivalence=check_equivalence,
+        warnings=warnings,
+        low_memory=low_memory,
+        output=output,
+        check=check)
     if not in_place and not quiet and reformatted_code:
       file_resources.WriteReformattedCode(filename, reformatted_code, encoding,
                                           in_place)
-    return has_change
+    return has_change, warnings
+  except tokenize.TokenError as e:
+    raise errors.YapfError('%s:%s:%s' % (filename, e.args[1][0], e.args[0]))
+  except SyntaxError as e:
+    e.filename = filename
+    raise
+  except verifier.EquivalenceError as e:
+    raise errors.YapfError('%s: %s' % (filename, e))
+
+
+def LintFiles(filenames,
+              lines,
+              style_config=None,
+              no_local_style=False,
+              parallel=False,
+              verbose=False,
+              warnings_format='jsonl'):
+  """Print the style warnings of a list of files without reformatting them.
+
+  Arguments:
+    filenames: (list of unicode) A list of files to check.
+    lines: (list of tuples of integers) A list of tuples of lines, [start, end],
+      that we want to check. The lines are 1-based indexed.
+    style_config: (string) Style name or file path.
+    no_local_style: (string) If style_config is None don't search for
+      directory-local style configuration.
+    parallel: (bool) True if should check multiple files in parallel.
+    verbose: (bool) True if should print out filenames while processing.
+    warnings_format: (string) The format of the warnings report (see
+      warn_msg.write_report).
+
+  Returns:
+    True if there are warnings in any of the files being checked.
+  """
+  all_warnings = []
+  if parallel:
+    import multiprocessing  # pylint: disable=g-import-not-at-top
+    import concurrent.futures  # pylint: disable=g-import-not-at-top
+    workers = min(multiprocessing.cpu_count(), len(filenames))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+      future_lints = [
+          executor.submit(_LintFile, filename, lines, style_config,
+                          no_local_style, verbose) for filename in filenames
+      ]
+      for future in concurrent.futures.as_completed(future_lints):
+        all_warnings.append(future.result())
+  else:
+    for filename in filenames:
+      all_warnings.append(
+          _LintFile(filename, lines, style_config, no_local_style, verbose))
+
+  warn_msg.write_report(all_warnings, warnings_format)
+  return any(all_warnings)
+
+
+def _LintFile(filename,
+              lines,
+              style_config=None,
+              no_local_style=False,
+              verbose=False):
+  """Return the rendered style warnings of an individual file."""
+  if verbose:
+    print('Checking %s' % filename)
+  if style_config is None and not no_local_style:
+    style_config = file_resources.GetDefaultStyleForDir(
+        os.path.dirname(filename))
+  try:
+    messages = yapf_api.LintFile(
+        filename,
+        style_config=style_config,
+        lines=lines,
+        logger=logging.warning)
   except tokenize.TokenError as e:
     raise errors.YapfError('%s:%s:%s' % (filename, e.args[1][0], e.args[0]))
   except SyntaxError as e:
     e.filename = filename
     raise
+  return messages.render()
 
 
 def _GetLines(line_strings):
@@ -150,6 +150,17 @@ def LineEnding(lines):
   return (sorted(endings, key=endings.get, reverse=True) or [LF])[0]
 
 
+def SourceLineEnding(source):
+  """Retrieve the line ending of the original source, given as a string."""
+  crlf = source.count(CRLF)
+  endings = {
+      CRLF: crlf,
+      CR: source.count(CR) - crlf,
+      LF: source.count(LF) - crlf
+  }
+  return sorted(endings, key=endings.get, reverse=True)[0]
+
+
 def _FindPythonFiles(filenames, recursive, exclude):
   """Find all Python files."""
   if exclude and any(e.startswith('./') for e in exclude):
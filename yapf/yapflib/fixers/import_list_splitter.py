@@ -23,12 +23,13 @@ vs a singe input statement).
 """
 
 
-import copy
-
-from .. import format_token
+from .. import pytree_utils
 from .. import style
 from .. import unwrapped_line
 
+_NEWLINES_ANNOTATIONS = (pytree_utils.Annotation.NEWLINES,
+                         pytree_utils.Annotation.ORIGINAL_NEWLINES)
+
 
 def is_import_stmt(uwl):
     if not uwl.tokens:
@@ -42,30 +43,43 @@ def has_comma(uwl):
 
 
 def split_import_list(uwl):
+    """ Build a statement per imported module in one pass over the tokens.
+    Every statement after the first one starts with a synthetic `import`.
+    """
+    lineno = uwl.lineno
+
     def append(tokens, token):
-        if tokens:
-            tokens[-1].next_token = token
-            token.previous_token = tokens[-1]
-            token.node.lineno = tokens[0].lineno
+        if token.lineno != lineno:
+            # the token is joined to the line of the statement (after a
+            # continuation), so it must not bring the newlines before it
+            for annotation in _NEWLINES_ANNOTATIONS:
+                pytree_utils.SetNodeAnnotation(token.node, annotation, None)
+            token.node.lineno = lineno
         if token.is_name:
             token.spaces_required_before = True
         tokens.append(token)
 
-    tokens = []
+    statements = [[]]
     for token in uwl.tokens:
         if token.value == ',':
-            token.value = ';'
-            tokens.append(token)
-
-            new_tok = copy.copy(uwl.tokens[0])
+            new_tok = uwl.first.Synthesize()
             new_tok.must_break_before = True
-            append(tokens, new_tok)
+            for annotation in _NEWLINES_ANNOTATIONS:
+                pytree_utils.SetNodeAnnotation(new_tok.node, annotation, None)
+            statements.append([new_tok])
 
         elif not token.is_continuation:
-            append(tokens, token)
-
-    uwl.tokens[:] = tokens
-    return uwl.Split()
+            append(statements[-1], token)
+
+    uwlines = []
+    for tokens in statements:
+        tokens[0].previous_token = None
+        tokens[-1].next_token = None
+        line = unwrapped_line.UnwrappedLine(uwl.depth, tokens)
+        pytree_utils.SetNodeAnnotation(line.first.node,
+                                       pytree_utils.Annotation.MUST_SPLIT, True)
+        uwlines.append(line)
+    return uwlines
 
 
 def split_import_lists(uwlines):
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Function: Sort the imports and group them by the origin of imported modules.
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+
+
+Every block of consecutive top-level imports is sorted and split into groups
+(separated by a blank line) in the following order:
+```
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+import numpy
+
+import mypackage.utils
+
+from . import sibling
+```
+i.e. __future__ imports, the standard library, third-party modules, first-party
+modules (see FIRST_PARTY_MODULES) and relative imports. Within a group plain
+imports come before `from` imports, and both are sorted by the module name.
+
+Comments, disabled lines and any other statements end a block, so they are
+never moved around. Note that the imported names are not sorted.
+"""
+
+import os
+import sys
+import sysconfig
+
+from .. import py3compat
+from .. import pytree_utils
+from .. import style
+from ..ordering_utils import shift_token_down
+
+FUTURE, STDLIB, THIRD_PARTY, FIRST_PARTY, LOCAL = range(5)
+
+
+def _stdlib_modules():
+    names = getattr(sys, 'stdlib_module_names', None)
+    if names is not None:
+        return frozenset(names)
+
+    # before python 3.10 the list of the modules has to be collected from
+    # the directories of the standard library
+    names = set(sys.builtin_module_names)
+    stdlib_dir = sysconfig.get_paths()['stdlib']
+    for dirname in (stdlib_dir, os.path.join(stdlib_dir, 'lib-dynload')):
+        if os.path.isdir(dirname):
+            names.update(entry.split('.')[0] for entry in os.listdir(dirname))
+
+    names.discard('site-packages')
+    return frozenset(names)
+
+
+# computed once, when the module is imported
+STDLIB_MODULES = _stdlib_modules()
+
+
+@py3compat.lru_cache(maxsize=None)
+def classify_module(module, first_party=()):
+    """ Return the group of an imported module. The same modules are imported
+    by most of the files, so the result is cached for the whole run.
+    """
+
+    if module.startswith('.'):
+        return LOCAL
+
+    top_level = module.split('.')[0]
+    if top_level == '__future__':
+        return FUTURE
+
+    # first-party modules may shadow the standard ones
+    if any(module == name or module.startswith(name + '.')
+           for name in first_party):
+        return FIRST_PARTY
+
+    if top_level in STDLIB_MODULES:
+        return STDLIB
+
+    return THIRD_PARTY
+
+
+def is_sortable_import(uwl):
+    return (not uwl.disable and uwl.depth == 0 and
+            uwl.first.value in ('import', 'from') and not uwl.has_semicolon)
+
+
+def imported_module(uwl):
+    """ 'a.b' for `import a.b as c` or `from a.b import c`."""
+
+    parts = []
+    for tok in uwl.tokens[1:]:
+        if tok.value in ('import', 'as', ',') or tok.is_comment:
+            break
+
+        parts.append(tok.value)
+
+    return ''.join(parts)
+
+
+def _sort_key(uwl, first_party):
+    module = imported_module(uwl)
+    return (classify_module(module, first_party), uwl.first.value == 'from',
+            module.lower())
+
+
+def _last_lineno(uwl):
+    return max(tok.lineno for tok in uwl.tokens)
+
+
+_NEWLINES_ANNOTATIONS = (pytree_utils.Annotation.NEWLINES,
+                         pytree_utils.Annotation.ORIGINAL_NEWLINES)
+
+
+def _sort_block(block, first_party):
+    """ Sort the block of imports in place and renumber its lines.
+
+     @:returns the number of lines the block has grown by
+    """
+    first_newlines = [
+        pytree_utils.GetNodeAnnotation(block[0].first.node, annotation)
+        for annotation in _NEWLINES_ANNOTATIONS
+    ]
+    block_end = max(_last_lineno(uwl) for uwl in block)
+
+    keyed_block = [(_sort_key(uwl, first_party), uwl) for uwl in block]
+    keyed_block.sort(key=lambda item: item[0])
+
+    lineno = block[0].lineno
+    prev_group = None
+    for index, (key, uwl) in enumerate(keyed_block):
+        group = key[0]
+        if index == 0:
+            newlines = first_newlines
+
+        elif group != prev_group:
+            # a blank line between the groups
+            lineno += 1
+            newlines = [None, 2]
+
+        else:
+            newlines = [None, 1]
+
+        for annotation, value in zip(_NEWLINES_ANNOTATIONS, newlines):
+            pytree_utils.SetNodeAnnotation(uwl.first.node, annotation, value)
+
+        offset = lineno - uwl.lineno
+        for tok in uwl.tokens:
+            shift_token_down(tok, offset)
+
+        lineno = _last_lineno(uwl) + 1
+        prev_group = group
+        block[index] = uwl
+
+    return lineno - 1 - block_end
+
+
+def _shift_line(uwl, offset):
+    if offset:
+        for tok in uwl.tokens:
+            shift_token_down(tok, offset)
+
+
+def sort_imports(uwlines):
+    if not style.Get('SORT_IMPORTS'):
+        return uwlines
+
+    first_party = tuple(
+        name for name in style.Get('FIRST_PARTY_MODULES') if name)
+
+    out_uwlines = []
+    block = []
+    # the number of lines the sorted blocks above have grown by
+    offset = 0
+    for uwl in uwlines + [None]:
+        if uwl is not None and is_sortable_import(uwl):
+            _shift_line(uwl, offset)
+            block.append(uwl)
+            continue
+
+        if block:
+            offset += _sort_block(block, first_party)
+            out_uwlines.extend(block)
+            block = []
+
+        if uwl is not None:
+            _shift_line(uwl, offset)
+            out_uwlines.append(uwl)
+
+    return out_uwlines
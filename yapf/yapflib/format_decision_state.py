@@ -52,6 +52,10 @@ class FormatDecisionState(object):
       properties applying to function parameter lists.
     ignore_stack_for_comparison: Ignore the stack of _ParenState for state
       comparison.
+    bracket_metrics: A table (of _BracketMetrics) keyed by the opening
+      brackets of the line. It's shared by all the cloned states.
+    opening_brackets: A table of the opening brackets containing the tokens
+      of the line, keyed by the tokens. It's shared by all the cloned states.
   """
 
   def __init__(self, line, first_indent):
@@ -75,18 +79,15 @@ class FormatDecisionState(object):
     self.param_list_stack = []
     self.first_indent = first_indent
     self.column_limit = style.Get('COLUMN_LIMIT')
+    self.bracket_metrics = {}
+    self.opening_brackets = {}
 
   def Clone(self):
     """Clones a FormatDecisionState object."""
-    new = FormatDecisionState(self.line, self.first_indent)
-    new.next_token = self.next_token
-    new.column = self.column
-    new.line = self.line
-    new.paren_level = self.paren_level
-    new.line.depth = self.line.depth
-    new.lowest_level_on_line = self.lowest_level_on_line
-    new.ignore_stack_for_comparison = self.ignore_stack_for_comparison
-    new.first_indent = self.first_indent
+    # The search clones a state for every edge it takes, so the attributes are
+    # copied over directly rather than initialized and then overwritten.
+    new = FormatDecisionState.__new__(FormatDecisionState)
+    new.__dict__.update(self.__dict__)
     new.stack = [state.Clone() for state in self.stack]
     new.comp_stack = [state.Clone() for state in self.comp_stack]
     new.param_list_stack = [state.Clone() for state in self.param_list_stack]
@@ -184,7 +185,7 @@ class FormatDecisionState(object):
     if (style.Get('SPLIT_ALL_TOP_LEVEL_COMMA_SEPARATED_VALUES') and
         previous.value == ','):
       # Avoid breaking in a container that fits in the current line if possible
-      opening = _GetOpeningBracket(current)
+      opening = self._GetOpeningBracket(current)
 
       # Can't find opening bracket, behave the same way as
       # SPLIT_ALL_COMMA_SEPARATED_VALUES
@@ -204,7 +205,7 @@ class FormatDecisionState(object):
         return current.node_split_penalty != split_penalty.UNBREAKABLE
 
     if (current.value == ')' and previous.value == ',' and
-        not _IsSingleElementTuple(current.matching_bracket)):
+        not self._IsSingleElementTuple(current.matching_bracket)):
       return True
 
     # Prevent splitting before the first argument in compound statements
@@ -248,24 +249,12 @@ class FormatDecisionState(object):
         current.is_name):
       # An expression that's surrounded by parens gets split after the opening
       # parenthesis.
-      def SurroundedByParens(token):
-        """Check if it's an expression surrounded by parentheses."""
-        while token:
-          if token.value == ',':
-            return False
-          if token.value == ')':
-            return not token.next_token
-          if token.OpensScope():
-            token = token.matching_bracket.next_token
-          else:
-            token = token.next_token
-        return False
-
       if (previous.value == '(' and not previous.is_pseudo_paren and
           not unwrapped_line.IsSurroundedByBrackets(previous)):
         pptoken = previous.previous_token
         if (pptoken and not pptoken.is_name and not pptoken.is_keyword and
-            SurroundedByParens(current)):
+            not previous.matching_bracket.next_token and
+            self._ScopeHasNoCommas(previous)):
           return True
 
     if (current.is_name or current.is_string) and previous.value == ',':
@@ -321,7 +310,7 @@ class FormatDecisionState(object):
         not current.is_comment):
       # Place each dictionary entry onto its own line.
       if previous.value == '{' and previous.previous_token:
-        opening = _GetOpeningBracket(previous.previous_token)
+        opening = self._GetOpeningBracket(previous.previous_token)
         if (opening and opening.value == '(' and opening.previous_token and
             opening.previous_token.is_name):
           # This is a dictionary that's an argument to a function.
@@ -329,7 +318,7 @@ class FormatDecisionState(object):
               previous.matching_bracket.next_token and
               (not opening.matching_bracket.next_token or
                opening.matching_bracket.next_token.value != '.') and
-              _ScopeHasNoCommas(previous)):
+              self._ScopeHasNoCommas(previous)):
             # Don't split before the key if:
             #   - The dictionary fits on a line, and
             #   - The function call isn't part of a builder-style call and
@@ -348,7 +337,7 @@ class FormatDecisionState(object):
       # Split before the dictionary value if we can't fit every dictionary
       # entry on its own line.
       if not current.OpensScope():
-        opening = _GetOpeningBracket(current)
+        opening = self._GetOpeningBracket(current)
         if not self._EachDictEntryFitsOnOneLine(opening):
           return style.Get('ALLOW_SPLIT_BEFORE_DICT_VALUE')
 
@@ -391,7 +380,7 @@ class FormatDecisionState(object):
           column = self.column - self.stack[-1].last_space
           return column > style.Get('CONTINUATION_INDENT_WIDTH')
 
-        opening = _GetOpeningBracket(current)
+        opening = self._GetOpeningBracket(current)
         if opening:
           return not self._ContainerFitsOnStartLine(opening)
 
@@ -402,7 +391,7 @@ class FormatDecisionState(object):
     if style.Get('SPLIT_ARGUMENTS_WHEN_COMMA_TERMINATED'):
       # Split before arguments in a function call or definition if the
       # arguments are terminated by a comma.
-      opening = _GetOpeningBracket(current)
+      opening = self._GetOpeningBracket(current)
       if opening and opening.previous_token and opening.previous_token.is_name:
         if previous.value in '(,':
           if opening.matching_bracket.previous_token.value == ',':
@@ -413,7 +402,7 @@ class FormatDecisionState(object):
       # If we have a function call within an argument list and it won't fit on
       # the remaining line, but it will fit on a line by itself, then go ahead
       # and split before the call.
-      opening = _GetOpeningBracket(current)
+      opening = self._GetOpeningBracket(current)
       if (opening and opening.value == '(' and opening.previous_token and
           (opening.previous_token.is_name or
            opening.previous_token.value in {'*', '**'})):
@@ -475,7 +464,7 @@ class FormatDecisionState(object):
             style.Get('SPLIT_BEFORE_FIRST_ARGUMENT')):
           return True
 
-        opening = _GetOpeningBracket(current)
+        opening = self._GetOpeningBracket(current)
         if (opening and opening.value == '(' and opening.previous_token and
             (opening.previous_token.is_name or
              opening.previous_token.value in {'*', '**'})):
@@ -977,99 +966,51 @@ class FormatDecisionState(object):
       length += len(start.value)
     return length + self.column <= self.column_limit
 
+  def _GetOpeningBracket(self, current):
+    """Get the opening bracket containing the current token."""
+    if not self.opening_brackets:
+      self.opening_brackets.update(_FindOpeningBrackets(self.line.tokens))
+    opening = self.opening_brackets.get(id(current), _NOT_COMPUTED)
+    if opening is _NOT_COMPUTED:
+      opening = _FindOpeningBracket(current)
+    return opening
+
+  def _GetBracketMetrics(self, opening):
+    """Get the metrics of the scope opened by the bracket."""
+    metrics = self.bracket_metrics.get(id(opening))
+    if metrics is None:
+      metrics = _BracketMetrics(opening)
+      self.bracket_metrics[id(opening)] = metrics
+    return metrics
+
   def _EachDictEntryFitsOnOneLine(self, opening):
     """Determine if each dict elems can fit on one line."""
-
-    def PreviousNonCommentToken(tok):
-      tok = tok.previous_token
-      while tok.is_comment:
-        tok = tok.previous_token
-      return tok
-
-    def ImplicitStringConcatenation(tok):
-      num_strings = 0
-      if tok.is_pseudo_paren:
-        tok = tok.next_token
-      while tok.is_string:
-        num_strings += 1
-        tok = tok.next_token
-      return num_strings > 1
-
-    def DictValueIsContainer(opening, closing):
-      if not opening or not closing:
-        return False
-      colon = opening.previous_token
-      while colon:
-        if not colon.is_pseudo_paren:
-          break
-        colon = colon.previous_token
-      if not colon or colon.value != ':':
-        return False
-      key = colon.previous_token
-      if not key:
-        return False
-      return format_token.Subtype.DICTIONARY_KEY_PART in key.subtypes
-
-    closing = opening.matching_bracket
-    entry_start = opening.next_token
-    current = opening.next_token.next_token
-
-    while current and current != closing:
-      if format_token.Subtype.DICTIONARY_KEY in current.subtypes:
-        prev = PreviousNonCommentToken(current)
-        if prev.value == ',':
-          prev = PreviousNonCommentToken(prev.previous_token)
-        if not DictValueIsContainer(prev.matching_bracket, prev):
-          length = prev.total_length - entry_start.total_length
-          length += len(entry_start.value)
-          if length + self.stack[-2].indent >= self.column_limit:
-            return False
-        entry_start = current
-      if current.OpensScope():
-        if ((current.value == '{' or
-             (current.is_pseudo_paren and current.next_token.value == '{') and
-             format_token.Subtype.DICTIONARY_VALUE in current.subtypes) or
-            ImplicitStringConcatenation(current)):
-          # A dictionary entry that cannot fit on a single line shouldn't matter
-          # to this calculation. If it can't fit on a single line, then the
-          # opening should be on the same line as the key and the rest on
-          # newlines after it. But the other entries should be on single lines
-          # if possible.
-          if current.matching_bracket:
-            current = current.matching_bracket
-          while current:
-            if current == closing:
-              return True
-            if format_token.Subtype.DICTIONARY_KEY in current.subtypes:
-              entry_start = current
-              break
-            current = current.next_token
-        else:
-          current = current.matching_bracket
-      else:
-        current = current.next_token
-
-    # At this point, current is the closing bracket. Go back one to get the end
-    # of the dictionary entry.
-    current = PreviousNonCommentToken(current)
-    length = current.total_length - entry_start.total_length
-    length += len(entry_start.value)
-    return length + self.stack[-2].indent <= self.column_limit
+    longest_entry, last_entry = (
+        self._GetBracketMetrics(opening).dict_entry_lengths)
+    indent = self.stack[-2].indent
+    if (longest_entry is not None and
+        longest_entry + indent >= self.column_limit):
+      return False
+    return last_entry is None or last_entry + indent <= self.column_limit
 
   def _ArgumentListHasDictionaryEntry(self, token):
     """Check if the function argument list has a dictionary as an arg."""
     if _IsArgumentToFunction(token):
-      while token:
-        if token.value == '{':
-          length = token.matching_bracket.total_length - token.total_length
-          return length + self.stack[-2].indent > self.column_limit
-        if token.ClosesScope():
-          break
-        if token.OpensScope():
-          token = token.matching_bracket
-        token = token.next_token
+      # The token is the first one after the opening bracket.
+      bracket = self._GetBracketMetrics(token.previous_token).first_dict
+      if bracket:
+        length = bracket.matching_bracket.total_length - bracket.total_length
+        return length + self.stack[-2].indent > self.column_limit
     return False
 
+  def _IsSingleElementTuple(self, opening):
+    """Check if it's a single-element tuple."""
+    return self._GetBracketMetrics(opening).num_commas == 1
+
+  def _ScopeHasNoCommas(self, opening):
+    """Check if the scope has no commas."""
+    return self._GetBracketMetrics(opening).num_commas == 0
+
   def _ContainerFitsOnStartLine(self, opening):
     """Check if the container can fit on its starting line.
 
@@ -1126,11 +1067,14 @@ def _GetLengthOfSubtype(token, subtype, exclude=None):
   return current.total_length - token.total_length + 1
 
 
-def _GetOpeningBracket(current):
+def _FindOpeningBracket(current):
   """Get the opening bracket containing the current token."""
   if current.matching_bracket and not current.is_pseudo_paren:
     return current if current.OpensScope() else current.matching_bracket
+  return _FindEnclosingBracket(current)
+
 
+def _FindEnclosingBracket(current):
   while current:
     if current.ClosesScope():
       current = current.matching_bracket
@@ -1142,6 +1086,52 @@ def _GetOpeningBracket(current):
   return None
 
 
+def _FindOpeningBrackets(tokens):
+  """Get the opening brackets containing the tokens of a line.
+
+  This gives the same brackets as _FindOpeningBracket(), but in a single pass
+  over the line: the backward search from a token continues from a token
+  before it, whose result is already known.
+
+  Arguments:
+    tokens: (list of FormatToken) The tokens of the line.
+
+  Returns:
+    A dict of the opening brackets (or None) keyed by the ids of the tokens.
+  """
+  # The results of _FindEnclosingBracket() by the ids of the tokens.
+  enclosing = {}
+
+  def FindEnclosingBracket(tok):
+    if tok is None:
+      return None
+    if id(tok) in enclosing:
+      return enclosing[id(tok)]
+    return _FindEnclosingBracket(tok)
+
+  opening_brackets = {}
+  for tok in tokens:
+    if tok.ClosesScope():
+      bracket = tok.matching_bracket
+      enclosing[id(tok)] = (
+          FindEnclosingBracket(bracket.previous_token) if bracket else None)
+    elif tok.is_pseudo_paren:
+      previous = tok.previous_token
+      enclosing[id(tok)] = (
+          FindEnclosingBracket(previous.previous_token) if previous else None)
+    elif tok.OpensScope():
+      enclosing[id(tok)] = tok
+    else:
+      enclosing[id(tok)] = FindEnclosingBracket(tok.previous_token)
+
+    if tok.matching_bracket and not tok.is_pseudo_paren:
+      opening_brackets[id(tok)] = (
+          tok if tok.OpensScope() else tok.matching_bracket)
+    else:
+      opening_brackets[id(tok)] = enclosing[id(tok)]
+  return opening_brackets
+
+
 def _LastTokenInLine(current):
   while not current.is_comment and current.next_token:
     current = current.next_token
@@ -1163,10 +1153,53 @@ def _IsLastScopeInLine(current):
   return True
 
 
-def _IsSingleElementTuple(token):
-  """Check if it's a single-element tuple."""
-  close = token.matching_bracket
-  token = token.next_token
+_NOT_COMPUTED = object()
+
+
+class _BracketMetrics(object):
+  """Properties of a bracketed scope, which depend only on the line's tokens.
+
+  They're queried over and over while searching for the best formatting of the
+  line, so each of them is computed on the first use and kept in the table of
+  the line's brackets (see FormatDecisionState.bracket_metrics).
+
+  Attributes:
+    opening: The opening bracket of the scope.
+    num_commas: The number of commas directly in the scope.
+    first_dict: The first dictionary (its opening bracket) directly in the
+      scope or None.
+    dict_entry_lengths: The lengths of the longest dictionary entry that must
+      fit on one line and of the last entry (None if it doesn't have to fit).
+  """
+
+  def __init__(self, opening):
+    self.opening = opening
+    self._num_commas = None
+    self._first_dict = _NOT_COMPUTED
+    self._dict_entry_lengths = None
+
+  @property
+  def num_commas(self):
+    if self._num_commas is None:
+      self._num_commas = _CountCommas(self.opening)
+    return self._num_commas
+
+  @property
+  def first_dict(self):
+    if self._first_dict is _NOT_COMPUTED:
+      self._first_dict = _FindFirstDict(self.opening)
+    return self._first_dict
+
+  @property
+  def dict_entry_lengths(self):
+    if self._dict_entry_lengths is None:
+      self._dict_entry_lengths = _GetDictEntryLengths(self.opening)
+    return self._dict_entry_lengths
+
+
+def _CountCommas(opening):
+  close = opening.matching_bracket
+  token = opening.next_token
   num_commas = 0
   while token != close:
     if token.value == ',':
@@ -1175,21 +1208,109 @@ def _IsSingleElementTuple(token):
       token = token.matching_bracket
     else:
       token = token.next_token
-  return num_commas == 1
+  return num_commas
 
 
-def _ScopeHasNoCommas(token):
-  """Check if the scope has no commas."""
-  close = token.matching_bracket
-  token = token.next_token
-  while token != close:
-    if token.value == ',':
-      return False
+def _FindFirstDict(opening):
+  token = opening.next_token
+  while token:
+    if token.value == '{':
+      return token
+    if token.ClosesScope():
+      break
     if token.OpensScope():
       token = token.matching_bracket
+    token = token.next_token
+  return None
+
+
+def _GetDictEntryLengths(opening):
+  """Get the lengths of the entries of a dictionary.
+
+  Arguments:
+    opening: (FormatToken) The opening bracket of the dictionary.
+
+  Returns:
+    A tuple of the length of the longest entry that must fit on one line (or
+    None if there isn't one) and the length of the last entry (or None if the
+    last entries don't have to fit on one line).
+  """
+
+  def PreviousNonCommentToken(tok):
+    tok = tok.previous_token
+    while tok.is_comment:
+      tok = tok.previous_token
+    return tok
+
+  def ImplicitStringConcatenation(tok):
+    num_strings = 0
+    if tok.is_pseudo_paren:
+      tok = tok.next_token
+    while tok.is_string:
+      num_strings += 1
+      tok = tok.next_token
+    return num_strings > 1
+
+  def DictValueIsContainer(opening, closing):
+    if not opening or not closing:
+      return False
+    colon = opening.previous_token
+    while colon:
+      if not colon.is_pseudo_paren:
+        break
+      colon = colon.previous_token
+    if not colon or colon.value != ':':
+      return False
+    key = colon.previous_token
+    if not key:
+      return False
+    return format_token.Subtype.DICTIONARY_KEY_PART in key.subtypes
+
+  longest_entry = None
+  closing = opening.matching_bracket
+  entry_start = opening.next_token
+  current = opening.next_token.next_token
+
+  while current and current != closing:
+    if format_token.Subtype.DICTIONARY_KEY in current.subtypes:
+      prev = PreviousNonCommentToken(current)
+      if prev.value == ',':
+        prev = PreviousNonCommentToken(prev.previous_token)
+      if not DictValueIsContainer(prev.matching_bracket, prev):
+        length = prev.total_length - entry_start.total_length
+        length += len(entry_start.value)
+        longest_entry = max(length, longest_entry or 0)
+      entry_start = current
+    if current.OpensScope():
+      if ((current.value == '{' or
+           (current.is_pseudo_paren and current.next_token.value == '{') and
+           format_token.Subtype.DICTIONARY_VALUE in current.subtypes) or
+          ImplicitStringConcatenation(current)):
+        # A dictionary entry that cannot fit on a single line shouldn't matter
+        # to this calculation. If it can't fit on a single line, then the
+        # opening should be on the same line as the key and the rest on
+        # newlines after it. But the other entries should be on single lines
+        # if possible.
+        if current.matching_bracket:
+          current = current.matching_bracket
+        while current:
+          if current == closing:
+            return longest_entry, None
+          if format_token.Subtype.DICTIONARY_KEY in current.subtypes:
+            entry_start = current
+            break
+          current = current.next_token
+      else:
+        current = current.matching_bracket
     else:
-      token = token.next_token
-  return True
+      current = current.next_token
+
+  # At this point, current is the closing bracket. Go back one to get the end
+  # of the dictionary entry.
+  current = PreviousNonCommentToken(current)
+  length = current.total_length - entry_start.total_length
+  length += len(entry_start.value)
+  return longest_entry, length
 
 
 class _ParenState(object):
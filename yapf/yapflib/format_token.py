@@ -19,9 +19,9 @@ This is a thin wrapper around a pytree.Leaf node.
 import keyword
 import re
 
+from lib2to3 import pytree
 from lib2to3.pgen2 import token
 
-from yapf.yapflib import py3compat
 from yapf.yapflib import pytree_utils
 from yapf.yapflib import style
 
@@ -117,8 +117,23 @@ class FormatToken(object):
       whitespace and this token. However, this doesn't include the initial
       indentation amount.
     split_penalty: The penalty for splitting the line before this token.
+
+  The classification of the token (its name, subtypes, is_comment, is_string,
+  is_docstring, ...) doesn't change once the tree is unwrapped, so it's
+  computed when the token is created instead of on every lookup. This also
+  keeps it valid when the tree is released (see reformatter.Reformat).
   """
 
+  __slots__ = ('node', 'next_token', 'previous_token', 'matching_bracket',
+               'parameters', 'container_opening', 'container_elements',
+               'whitespace_prefix', 'can_break_before', 'must_break_before',
+               'total_length', 'split_penalty', 'spaces_required_before',
+               'value', 'name', 'subtypes', 'is_comment', 'is_continuation',
+               'is_number', 'is_string', 'is_keyword', 'is_name',
+               'is_multiline_string', 'is_docstring', 'is_pseudo_paren',
+               'is_binary_op', 'is_a_expr_op', 'is_m_expr_op',
+               'is_arithmetic_op', 'is_simple_expr')
+
   def __init__(self, node):
     """Constructor.
 
@@ -138,15 +153,40 @@ class FormatToken(object):
     self.total_length = 0  # TODO(morbo): Think up a better name.
     self.split_penalty = 0
 
+    self.name = pytree_utils.NodeName(node)
+    self.is_comment = node.type == token.COMMENT
+    self.is_continuation = node.type == CONTINUATION
+    self.is_number = node.type == token.NUMBER
+    self.is_string = node.type == token.STRING
+    self.is_pseudo_paren = getattr(node, 'is_pseudo', False)
+
     if self.is_comment:
       self.spaces_required_before = style.Get('SPACES_BEFORE_COMMENT')
     else:
       self.spaces_required_before = 0
 
     if self.is_continuation:
-      self.value = self.node.value.rstrip()
+      self.value = node.value.rstrip()
     else:
-      self.value = self.node.value
+      self.value = node.value
+
+    # Only the values of comments and docstrings are changed later on, which
+    # keeps these in line with the value.
+    self.is_keyword = keyword.iskeyword(self.value)
+    self.is_name = node.type == token.NAME and not self.is_keyword
+    # A multiline string always ends with triple quotes.
+    self.is_multiline_string = (
+        self.is_string and self.value.endswith(('"""', "'''")))
+    self.is_docstring = self.is_multiline_string and not node.prev_sibling
+
+    subtypes = pytree_utils.GetNodeAnnotation(node,
+                                              pytree_utils.Annotation.SUBTYPE)
+    self.subtypes = [Subtype.NONE] if subtypes is None else subtypes
+    self.is_binary_op = Subtype.BINARY_OPERATOR in self.subtypes
+    self.is_a_expr_op = Subtype.A_EXPR_OPERATOR in self.subtypes
+    self.is_m_expr_op = Subtype.M_EXPR_OPERATOR in self.subtypes
+    self.is_arithmetic_op = self.is_a_expr_op or self.is_m_expr_op
+    self.is_simple_expr = Subtype.SIMPLE_EXPRESSION in self.subtypes
 
   @property
   def formatted_whitespace_prefix(self):
@@ -246,6 +286,32 @@ class FormatToken(object):
 
     self.spaces_required_before = cur_column - (prev_column + prev_len)
 
+  def Synthesize(self):
+    """Create a synthetic copy of the token.
+
+    The copy wraps a new leaf (not inserted into the tree) with the same value
+    and annotations. Unlike a shallow copy of the token, changing the copy's
+    node, e.g. its line number, doesn't affect this token.
+
+    Returns:
+      A new FormatToken with the same formatting information.
+    """
+    leaf = pytree.Leaf(
+        self.node.type,
+        self.node.value,
+        context=('', (self.node.lineno, self.node.column)))
+    leaf.parent = self.node.parent
+    pytree_utils.CopyYapfAnnotations(self.node, leaf)
+
+    tok = FormatToken(leaf)
+    tok.whitespace_prefix = self.whitespace_prefix
+    tok.spaces_required_before = self.spaces_required_before
+    tok.can_break_before = self.can_break_before
+    tok.must_break_before = self.must_break_before
+    tok.total_length = self.total_length
+    tok.split_penalty = self.split_penalty
+    return tok
+
   def OpensScope(self):
     return self.value in pytree_utils.OPENING_BRACKETS
 
@@ -259,7 +325,6 @@ class FormatToken(object):
     return msg
 
   @property
-  @py3compat.lru_cache()
   def node_split_penalty(self):
     """Split penalty attached to the pytree node of this token."""
     return pytree_utils.GetNodeAnnotation(
@@ -290,98 +355,6 @@ class FormatToken(object):
     """The original line number of the node in the source."""
     return self.node.lineno
 
-  @property
-  @py3compat.lru_cache()
-  def subtypes(self):
-    """Extra type information for directing formatting."""
-    value = pytree_utils.GetNodeAnnotation(self.node,
-                                           pytree_utils.Annotation.SUBTYPE)
-    return [Subtype.NONE] if value is None else value
-
-  @property
-  @py3compat.lru_cache()
-  def is_binary_op(self):
-    """Token is a binary operator."""
-    return Subtype.BINARY_OPERATOR in self.subtypes
-
-  @property
-  @py3compat.lru_cache()
-  def is_a_expr_op(self):
-    """Token is an a_expr operator."""
-    return Subtype.A_EXPR_OPERATOR in self.subtypes
-
-  @property
-  @py3compat.lru_cache()
-  def is_m_expr_op(self):
-    """Token is an m_expr operator."""
-    return Subtype.M_EXPR_OPERATOR in self.subtypes
-
-  @property
-  @py3compat.lru_cache()
-  def is_arithmetic_op(self):
-    """Token is an arithmetic operator."""
-    return self.is_a_expr_op or self.is_m_expr_op
-
-  @property
-  @py3compat.lru_cache()
-  def is_simple_expr(self):
-    """Token is an operator in a simple expression."""
-    return Subtype.SIMPLE_EXPRESSION in self.subtypes
-
-  @property
-  @py3compat.lru_cache()
-  def name(self):
-    """A string representation of the node's name."""
-    return pytree_utils.NodeName(self.node)
-
-  @property
-  def is_comment(self):
-    return self.node.type == token.COMMENT
-
-  @property
-  def is_continuation(self):
-    return self.node.type == CONTINUATION
-
-  @property
-  @py3compat.lru_cache()
-  def is_keyword(self):
-    return keyword.iskeyword(self.value)
-
-  @property
-  @py3compat.lru_cache()
-  def is_name(self):
-    return self.node.type == token.NAME and not self.is_keyword
-
-  @property
-  def is_number(self):
-    return self.node.type == token.NUMBER
-
-  @property
-  def is_string(self):
-    return self.node.type == token.STRING
-
-  @property
-  @py3compat.lru_cache()
-  def is_multiline_string(self):
-    """Test if this string is a multiline string.
-
-    Returns:
-      A multiline string always ends with triple quotes, so if it is a string
-      token, inspect the last 3 characters and return True if it is a triple
-      double or triple single quote mark.
-    """
-    return self.is_string and self.value.endswith(('"""', "'''"))
-
-  @property
-  @py3compat.lru_cache()
-  def is_docstring(self):
-    return self.is_multiline_string and not self.node.prev_sibling
-
-  @property
-  @py3compat.lru_cache()
-  def is_pseudo_paren(self):
-    return hasattr(self.node, 'is_pseudo') and self.node.is_pseudo
-
   @property
   def is_pylint_comment(self):
     return self.is_comment and re.match(r'#.*\bpylint:\s*(disable|enable)=',
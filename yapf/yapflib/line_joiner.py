@@ -41,13 +41,15 @@ from yapf.yapflib import style
 _CLASS_OR_FUNC = frozenset({'def', 'class'})
 
 
-def CanMergeMultipleLines(lines, last_was_merged=False):
+def CanMergeMultipleLines(lines, last_was_merged=False, index=0):
   """Determine if multiple lines can be joined into one.
 
   Arguments:
     lines: (list of UnwrappedLine) This is a splice of UnwrappedLines from the
       full code base.
     last_was_merged: (bool) The last line was merged.
+    index: (int) The index of the starting line in lines. Only the few lines
+      from there on are looked at, so the lines don't need to be spliced.
 
   Returns:
     True if two consecutive lines can be joined together. In reality, this will
@@ -56,37 +58,39 @@ def CanMergeMultipleLines(lines, last_was_merged=False):
   # The indentation amount for the starting line (number of spaces).
   column_limit = style.Get('COLUMN_LIMIT') or float('inf')
 
-  indent_amt = lines[0].depth * style.Get('INDENT_WIDTH')
-  if len(lines) == 1 or indent_amt > column_limit:
+  first = lines[index]
+  indent_amt = first.depth * style.Get('INDENT_WIDTH')
+  if len(lines) - index == 1 or indent_amt > column_limit:
     return False
 
-  if (len(lines) >= 3 and lines[2].depth >= lines[1].depth and
-      lines[0].depth != lines[2].depth):
-    # If lines[2]'s depth is greater than or equal to line[1]'s depth, we're not
-    # looking at a single statement (e.g., if-then, while, etc.). A following
-    # line with the same depth as the first line isn't part of the lines we
-    # would want to combine.
+  second = lines[index + 1]
+  if (len(lines) - index >= 3 and lines[index + 2].depth >= second.depth and
+      first.depth != lines[index + 2].depth):
+    # If the third line's depth is greater than or equal to the second line's
+    # depth, we're not looking at a single statement (e.g., if-then, while,
+    # etc.). A following line with the same depth as the first line isn't part
+    # of the lines we would want to combine.
     return False  # Don't merge more than two lines together.
 
-  if lines[0].first.value in _CLASS_OR_FUNC:
+  if first.first.value in _CLASS_OR_FUNC:
     # Don't join lines onto the starting line of a class or function.
     return False
 
   limit = column_limit - indent_amt
-  if lines[0].last.total_length < limit:
-    limit -= lines[0].last.total_length
+  if first.last.total_length < limit:
+    limit -= first.last.total_length
 
-    if lines[0].first.value == 'if':
-      return _CanMergeLineIntoIfStatement(lines, limit)
-    if last_was_merged and lines[0].first.value in {'elif', 'else'}:
-      return _CanMergeLineIntoIfStatement(lines, limit)
+    if first.first.value == 'if':
+      return _CanMergeLineIntoIfStatement(first, second, limit)
+    if last_was_merged and first.first.value in {'elif', 'else'}:
+      return _CanMergeLineIntoIfStatement(first, second, limit)
 
   # TODO(morbo): Other control statements?
 
   return False
 
 
-def _CanMergeLineIntoIfStatement(lines, limit):
+def _CanMergeLineIntoIfStatement(first, second, limit):
   """Determine if we can merge a short if-then statement into one line.
 
   Two lines of an if-then statement can be merged if they were that way in the
@@ -95,19 +99,20 @@ def _CanMergeLineIntoIfStatement(lines, limit):
   'continue', and 'break'.
 
   Arguments:
-    lines: (list of UnwrappedLine) The lines we are wanting to merge.
+    first: (UnwrappedLine) The line we are wanting to merge into.
+    second: (UnwrappedLine) The line we are wanting to merge.
     limit: (int) The amount of space remaining on the line.
 
   Returns:
     True if the lines can be merged, False otherwise.
   """
-  if len(lines[1].tokens) == 1 and lines[1].last.is_multiline_string:
+  if len(second.tokens) == 1 and second.last.is_multiline_string:
     # This might be part of a multiline shebang.
     return True
-  if lines[0].lineno != lines[1].lineno:
+  if first.lineno != second.lineno:
     # Don't merge lines if the original lines weren't merged.
     return False
-  if lines[1].last.total_length >= limit:
+  if second.last.total_length >= limit:
     # Don't merge lines if the result goes over the column limit.
     return False
   return style.Get('JOIN_MULTIPLE_LINES') or math.isinf(limit)
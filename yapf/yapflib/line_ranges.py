@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Function: Sorted interval representation of the lines that may be reformatted
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+
+
+The `--lines` option (and the hunks of a diff that editors pass to yapf) are
+kept as merged, sorted, inclusive [start, end] intervals instead of a set
+holding every line number. Every query is a bisect over the interval bounds.
+"""
+
+import bisect
+
+
+class LineRanges(object):
+    """ Disjoint, sorted and inclusive line ranges."""
+
+    def __init__(self, ranges=()):
+        self._starts = []
+        self._ends = []
+
+        for start, end in sorted(ranges):
+            if self._ends and start <= self._ends[-1] + 1:
+                # overlapping or adjacent ranges are merged together
+                self._ends[-1] = max(self._ends[-1], end)
+
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, lineno):
+        return self.Overlaps(lineno, lineno)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends))
+
+    def __repr__(self):
+        return 'LineRanges(%r)' % list(self)
+
+    def Overlaps(self, start, end):
+        """ Return True if any line in [start, end] is in the ranges."""
+
+        # the last range that starts before the end of [start, end] is the
+        # only one which can overlap it: all the previous ones end earlier
+        index = bisect.bisect_right(self._starts, end) - 1
+        return index >= 0 and self._ends[index] >= start
+
+    def CountOverlap(self, start, end):
+        """ Return the number of lines in [start, end] in the ranges."""
+
+        if start > end:
+            return 0
+
+        count = 0
+        index = bisect.bisect_left(self._ends, start)
+        while index < len(self._starts) and self._starts[index] <= end:
+            count += (min(end, self._ends[index]) -
+                      max(start, self._starts[index]) + 1)
+            index += 1
+
+        return count
+
+
+def CreateLineRanges(ranges):
+    """ Return LineRanges for a list of [start, end] pairs, or None if there
+    is no line range restriction.
+    """
+
+    if ranges is None:
+        return None
+
+    return LineRanges(ranges)
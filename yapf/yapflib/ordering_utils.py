@@ -32,7 +32,8 @@ def move_lines_to_index(uwline_index_to, lineno, uwlines, lines):
         lineno += 1
 
     # filtering moved values and removing them from uwlines
-    uwlines[:] = [line for line in uwlines if line not in lines]
+    moved_lines = set(id(line) for line in lines)
+    uwlines[:] = [line for line in uwlines if id(line) not in moved_lines]
 
     uwlines[uwline_index_to:uwline_index_to] = lines
     return lineno_where_line_was_taken_from
@@ -48,14 +49,31 @@ def restore_lineno(index_after_insert, uwlines,
     # start changing lineno from index + import lines
     index_after_insert += len(lineno_where_lines_were_taken_from)
 
+    # every line taken from below a token shifts it down
+    taken_below = count_greater_linenos(lineno_where_lines_were_taken_from)
+
     for line in uwlines[index_after_insert:]:
         for tok in line.tokens:
-            for num in lineno_where_lines_were_taken_from:
-                if tok.lineno < num:
-                    shift_token_down(tok, shift_size)
+            lineno = tok.lineno
+            shift = taken_below[lineno] if lineno < len(taken_below) else 0
 
             # shifting all tokens after index to have newline after inserts
-            shift_token_down(tok, 1)
+            shift_token_down(tok, shift * shift_size + 1)
+
+
+def count_greater_linenos(linenos):
+    """Return a list where the item at a line number is the number of
+    `linenos` which are greater than it, so that it is computed once for
+    all tokens instead of scanning `linenos` for each of them.
+    """
+    counts = [0] * (max(linenos, default=0) + 1)
+    for num in linenos:
+        counts[num - 1] += 1
+
+    # suffix sums: counts[i] = number of linenos that are >= i + 1
+    for i in range(len(counts) - 2, -1, -1):
+        counts[i] += counts[i + 1]
+    return counts
 
 
 def shift_token_down(tok, newlines_num):
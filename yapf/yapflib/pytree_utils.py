@@ -82,6 +82,25 @@ def LastLeafNode(node):
   return LastLeafNode(node.children[-1])
 
 
+def ReleaseTree(tree):
+  """Detach all the nodes of a tree from their parents.
+
+  Without the reference cycles between the parents and their children, the
+  interior nodes are freed as soon as nothing refers to the root any longer,
+  instead of waiting for the cyclic garbage collector. The leaves and the
+  subtrees that are still referenced elsewhere are kept with their annotations,
+  but they don't know their parents and siblings any longer.
+
+  Arguments:
+    tree: the root of the tree.
+  """
+  nodes = [tree]
+  while nodes:
+    node = nodes.pop()
+    node.parent = None
+    nodes.extend(node.children)
+
+
 # lib2to3 thoughtfully provides pygram.python_grammar_no_print_statement for
 # parsing Python 3 code that wouldn't parse otherwise (when 'print' is used in a
 # context where a keyword is disallowed).
@@ -227,9 +246,9 @@ def CopyYapfAnnotations(src, dst):
     src: the source node.
     dst: the destination node.
   """
-  for annotation in dir(src):
+  for annotation, value in list(vars(src).items()):
     if annotation.startswith(_NODE_ANNOTATION_PREFIX):
-      setattr(dst, annotation, getattr(src, annotation, None))
+      setattr(dst, annotation, value)
 
 
 def GetNodeAnnotation(node, annotation, default=None):
@@ -306,6 +325,35 @@ def SetOpeningBracket(node, bracket):
   setattr(node, _NODE_ANNOTATION_PREFIX + 'container_bracket', bracket)
 
 
+class DetachedLeaf(object):
+  """A compact copy of a leaf, which isn't part of any tree.
+
+  Only the fields and the annotations that are used once the lines are
+  unwrapped are copied, so a token can refer to it instead of its leaf when the
+  tree is released (see ReleaseTree).
+  """
+
+  _ANNOTATIONS = tuple(_NODE_ANNOTATION_PREFIX + annotation
+                       for annotation in (Annotation.NEWLINES,
+                                          Annotation.MUST_SPLIT,
+                                          Annotation.ORIGINAL_NEWLINES,
+                                          Annotation.SPLIT_PENALTY,
+                                          Annotation.SUBTYPE))
+
+  __slots__ = ('type', 'value', 'lineno', 'column', 'parent') + _ANNOTATIONS
+
+  def __init__(self, leaf):
+    self.type = leaf.type
+    self.value = leaf.value
+    self.lineno = leaf.lineno
+    self.column = leaf.column
+    self.parent = None
+    for name in self._ANNOTATIONS:
+      value = getattr(leaf, name, self)
+      if value is not self:
+        setattr(self, name, value)
+
+
 def DumpNodeToString(node):
   """Dump a string representation of the given node. For debugging.
 
@@ -40,19 +40,40 @@ from yapf.yapflib.fixers.fix_shebang_comment import fix_shebang_comment_header
 from yapf.yapflib.fixers.fix_copyright_doc_string import format_doc_strings
 
 
-def Reformat(uwlines, filename='<unknown>', verify=False, lines=None):
+def Reformat(uwlines,
+             filename='<unknown>',
+             verify=False,
+             lines=None,
+             warnings=None,
+             release_tree=False,
+             output=None):
   """Reformat the unwrapped lines.
 
   Arguments:
     uwlines: (list of unwrapped_line.UnwrappedLine) Lines we want to format.
     verify: (bool) True if reformatted code should be verified for syntax.
-    lines: (set of int) The lines which can be modified or None if there is no
-      line range restriction.
+    lines: (line_ranges.LineRanges) The lines which can be modified or None if
+      there is no line range restriction.
     filename: name (full path) of the source file used for code style fixing
+    warnings: (list) If not None, the rendered style warnings are appended to
+      it instead of being printed out.
+    release_tree: (bool) If True, the pytree the lines were unwrapped from is
+      freed once the warnings are checked, and the tokens refer to compact
+      copies of their leaves (see pytree_utils.DetachedLeaf) while the lines
+      are formatted. The caller must not hold a reference to the tree.
+    output: (callable) If not None, the reformatted code is passed to it in
+      chunks, each one as soon as it's complete, instead of being returned. A
+      chunk ends before a blank line, which the trailing comments are never
+      aligned across.
 
   Returns:
-    A string representing the reformatted code.
+    A string representing the reformatted code, or None if it was passed to
+    output.
   """
+  chunks = []
+  write = chunks.append if output is None else output
+  verified_lines = [] if verify else None
+  lineno = 1  # The line number of the next formatted line.
   final_lines = []
   prev_uwline = None  # The previous line.
   indent_width = style.Get('INDENT_WIDTH')
@@ -61,7 +82,9 @@ def Reformat(uwlines, filename='<unknown>', verify=False, lines=None):
   # special checks for a format of a header that can produce warnings
   fix_shebang_comment_header(uwlines, style)
   format_doc_strings(uwlines, style)
-  messages = warns.check_all_recommendations(uwlines, style, filename)
+  messages = warns.check_all_recommendations(uwlines, style, filename, lines)
+  if release_tree:
+    _ReleaseTree(uwlines)
 
   for uwline in _SingleOrMergedLines(uwlines):
     first_token = uwline.first
@@ -114,16 +137,41 @@ def Reformat(uwlines, filename='<unknown>', verify=False, lines=None):
         _RetainRequiredVerticalSpacing(uwline, prev_uwline, None)
         _EmitLineUnformatted(state)
 
+    if output is not None and final_lines and _StartsChunk(uwline):
+      lineno = _WriteLines(final_lines, lineno, messages, write,
+                           verified_lines)
+      final_lines = []
+
     final_lines.append(uwline)
     prev_uwline = uwline
 
-  _AlignTrailingComments(final_lines)
-  formatted_lines = _FormatFinalLines(final_lines)
+  _WriteLines(final_lines, lineno, messages, write, verified_lines)
+  write('\n')
 
-  _UpdateWarnLocations(formatted_lines, messages)
-  messages.show()
+  if warnings is None:
+    messages.show()
+  else:
+    warnings.extend(messages.render())
+
+  if verify:
+    verifier.VerifyModule(''.join(verified_lines) + '\n', verified_lines)
+  return ''.join(chunks) if output is None else None
 
-  return _ToText(formatted_lines, verify)
+
+def _ReleaseTree(uwlines):
+  """Release the pytree the lines were unwrapped from (see Reformat)."""
+  if not uwlines:
+    return
+  root = uwlines[0].first.node
+  while root.parent:
+    root = root.parent
+  pytree_utils.ReleaseTree(root)
+  # Free the interior nodes first, then each leaf as soon as its token refers
+  # to a copy.
+  del root
+  for uwline in uwlines:
+    for tok in uwline.tokens:
+      tok.node = pytree_utils.DetachedLeaf(tok.node)
 
 
 def _RetainHorizontalSpacing(uwline):
@@ -136,7 +184,7 @@ def _RetainRequiredVerticalSpacing(cur_uwline, prev_uwline, lines):
   """Retain all vertical spacing between lines."""
   if cur_uwline.disable and (not prev_uwline or prev_uwline.disable):
     # If both lines are disabled we aren't allowed to reformat anything.
-    lines = set()
+    lines = None
 
   prev_tok = None
   if prev_uwline is not None:
@@ -149,7 +197,7 @@ def _RetainRequiredVerticalSpacing(cur_uwline, prev_uwline, lines):
     if cur_uwline.disable:
       # After the first token we are acting on a single line. So if it is
       # disabled we must not reformat.
-      lines = set()
+      lines = None
 
 
 def _RetainRequiredVerticalSpacingBetweenTokens(cur_tok, prev_tok, lines):
@@ -181,8 +229,7 @@ def _RetainRequiredVerticalSpacingBetweenTokens(cur_tok, prev_tok, lines):
     pass
   elif lines and (cur_lineno in lines or prev_lineno in lines):
     desired_newlines = cur_tok.whitespace_prefix.count('\n')
-    whitespace_lines = range(prev_lineno + 1, cur_lineno)
-    deletable_lines = len(lines.intersection(whitespace_lines))
+    deletable_lines = lines.CountOverlap(prev_lineno + 1, cur_lineno - 1)
     required_newlines = max(required_newlines - deletable_lines,
                             desired_newlines)
 
@@ -289,140 +336,174 @@ def _CanPlaceOnSingleLine(uwline):
 
 
 def _AlignTrailingComments(final_lines):
-  final_lines_index = 0
-  while final_lines_index < len(final_lines):
-    line = final_lines[final_lines_index]
+  """Align the trailing comments of the lines in each block.
+
+  All trailing comments and comments that appear on a line by themselves in a
+  block should be indented at the same level. The block is terminated by an
+  empty line or EOF. The lines are visited once: the lengths of the code before
+  the comments are computed while looking for the end of the block, and then
+  the comments are aligned to the first column greater than the max length.
+  """
+  index = 0
+  while index < len(final_lines):
+    line = final_lines[index]
     assert line.tokens
 
-    processed_content = False
+    for aligned_tok in line.tokens:
+      if (aligned_tok.is_comment and
+          isinstance(aligned_tok.spaces_required_before, list) and
+          aligned_tok.value.startswith('#')):
+        break
+    else:
+      index += 1
+      continue
 
-    for tok in line.tokens:
-      if (tok.is_comment and isinstance(tok.spaces_required_before, list) and
-          tok.value.startswith('#')):
-        # All trailing comments and comments that appear on a line by themselves
-        # in this block should be indented at the same level. The block is
-        # terminated by an empty line or EOF. Enumerate through each line in
-        # the block and calculate the max line length. Once complete, use the
-        # first col value greater than that value and create the necessary for
-        # each line accordingly.
-        all_pc_line_lengths = []  # All pre-comment line lengths
-        max_line_length = 0
+    block_comments = []  # The comments with the lengths of the code before them
+    max_line_length = 0
 
-        while True:
-          # EOF
-          if final_lines_index + len(all_pc_line_lengths) == len(final_lines):
-            break
+    end = index
+    while end < len(final_lines):
+      this_line = final_lines[end]
 
-          this_line = final_lines[final_lines_index + len(all_pc_line_lengths)]
+      # Blank line - note that content is preformatted so we don't need to
+      # worry about spaces/tabs; a blank line will always be '\n\n'.
+      assert this_line.tokens
+      if (end > index and
+          this_line.tokens[0].formatted_whitespace_prefix.startswith('\n\n')):
+        break
 
-          # Blank line - note that content is preformatted so we don't need to
-          # worry about spaces/tabs; a blank line will always be '\n\n'.
-          assert this_line.tokens
-          if (all_pc_line_lengths and
-              this_line.tokens[0].formatted_whitespace_prefix.startswith('\n\n')
-             ):
-            break
+      end += 1
+      if this_line.disable:
+        continue
 
-          if this_line.disable:
-            all_pc_line_lengths.append([])
-            continue
+      line_length, comments = _PreCommentLineLengths(this_line)
+      max_line_length = max(max_line_length, line_length)
+      block_comments.extend(comments)
 
-          # Calculate the length of each line in this unwrapped line.
-          line_content = ''
-          pc_line_lengths = []
+    # Calculate the aligned column value
+    max_line_length += 2
 
-          for line_tok in this_line.tokens:
-            whitespace_prefix = line_tok.formatted_whitespace_prefix
+    aligned_col = None
+    for potential_col in aligned_tok.spaces_required_before:
+      if potential_col > max_line_length:
+        aligned_col = potential_col
+        break
 
-            newline_index = whitespace_prefix.rfind('\n')
-            if newline_index != -1:
-              max_line_length = max(max_line_length, len(line_content))
-              line_content = ''
+    if aligned_col is None:
+      aligned_col = max_line_length
 
-              whitespace_prefix = whitespace_prefix[newline_index + 1:]
+    # Update the comment token values based on the aligned values
+    for comment_tok, pc_line_length in block_comments:
+      assert pc_line_length < aligned_col
 
-            if line_tok.is_comment:
-              pc_line_lengths.append(len(line_content))
-            else:
-              line_content += '{}{}'.format(whitespace_prefix, line_tok.value)
+      # Note that there may be newlines embedded in the comments, so we need to
+      # apply a whitespace prefix to each line.
+      whitespace = ' ' * (aligned_col - pc_line_length - 1)
+      line_content = []
 
-          if pc_line_lengths:
-            max_line_length = max(max_line_length, max(pc_line_lengths))
+      for comment_line_index, comment_line in enumerate(
+          comment_tok.value.split('\n')):
+        line_content.append('{}{}'.format(whitespace, comment_line.strip()))
 
-          all_pc_line_lengths.append(pc_line_lengths)
+        if comment_line_index == 0:
+          whitespace = ' ' * (aligned_col - 1)
 
-        # Calculate the aligned column value
-        max_line_length += 2
+      line_content = '\n'.join(line_content)
 
-        aligned_col = None
-        for potential_col in tok.spaces_required_before:
-          if potential_col > max_line_length:
-            aligned_col = potential_col
-            break
+      # Account for initial whitespace already slated for the beginning of the
+      # line.
+      existing_whitespace_prefix = \
+        comment_tok.formatted_whitespace_prefix.lstrip('\n')
 
-        if aligned_col is None:
-          aligned_col = max_line_length
+      if line_content.startswith(existing_whitespace_prefix):
+        line_content = line_content[len(existing_whitespace_prefix):]
 
-        # Update the comment token values based on the aligned values
-        for all_pc_line_lengths_index, pc_line_lengths in enumerate(
-            all_pc_line_lengths):
-          if not pc_line_lengths:
-            continue
+      comment_tok.value = line_content
 
-          this_line = final_lines[final_lines_index + all_pc_line_lengths_index]
+    index = end
 
-          pc_line_length_index = 0
-          for line_tok in this_line.tokens:
-            if line_tok.is_comment:
-              assert pc_line_length_index < len(pc_line_lengths)
-              assert pc_line_lengths[pc_line_length_index] < aligned_col
 
-              # Note that there may be newlines embedded in the comments, so
-              # we need to apply a whitespace prefix to each line.
-              whitespace = ' ' * (
-                  aligned_col - pc_line_lengths[pc_line_length_index] - 1)
-              pc_line_length_index += 1
+def _PreCommentLineLengths(line):
+  """Calculate the lengths of the code before the comments of a line.
 
-              line_content = []
+  Arguments:
+    line: (unwrapped_line.UnwrappedLine) The formatted line.
 
-              for comment_line_index, comment_line in enumerate(
-                  line_tok.value.split('\n')):
-                line_content.append('{}{}'.format(whitespace,
-                                                  comment_line.strip()))
+  Returns:
+    A tuple of the max length of the code lines before a comment or a newline,
+    and a list of (comment token, length of the code before it) pairs.
+  """
+  max_length = 0
+  length = 0
+  comments = []
+
+  for tok in line.tokens:
+    whitespace_prefix = tok.formatted_whitespace_prefix
+
+    newline_index = whitespace_prefix.rfind('\n')
+    if newline_index != -1:
+      max_length = max(max_length, length)
+      length = 0
+      whitespace_length = len(whitespace_prefix) - newline_index - 1
+    else:
+      whitespace_length = len(whitespace_prefix)
 
-                if comment_line_index == 0:
-                  whitespace = ' ' * (aligned_col - 1)
+    if tok.is_comment:
+      comments.append((tok, length))
+      max_length = max(max_length, length)
+    else:
+      length += whitespace_length + len(tok.value)
 
-              line_content = '\n'.join(line_content)
+  return max_length, comments
 
-              # Account for initial whitespace already slated for the
-              # beginning of the line.
-              existing_whitespace_prefix = \
-                line_tok.formatted_whitespace_prefix.lstrip('\n')
 
-              if line_content.startswith(existing_whitespace_prefix):
-                line_content = line_content[len(existing_whitespace_prefix):]
+def _StartsChunk(uwline):
+  """Whether the lines before the formatted line can be written out.
 
-              line_tok.value = line_content
+  The trailing comments aren't aligned across a blank line, and only the
+  comment lines right before a top-level definition are changed once they're
+  formatted (see _CalculateNumberOfNewlines).
+  """
+  return (uwline.tokens[0].formatted_whitespace_prefix.startswith('\n\n') and
+          not uwline.is_comment and not uwline.last.is_comment)
 
-          assert pc_line_length_index == len(pc_line_lengths)
 
-        final_lines_index += len(all_pc_line_lengths)
+def _WriteLines(final_lines, lineno, messages, write, verified_lines=None):
+  """Write out a block of formatted lines, which ends before a blank line.
 
-        processed_content = True
-        break
+  Arguments:
+    final_lines: (list of unwrapped_line.UnwrappedLine) The formatted lines.
+    lineno: (int) The line number of the first line in the output file.
+    messages: (warn_msg.Messages) The warnings, which are located at the lines.
+    write: (callable) Called with the text of the lines.
+    verified_lines: (list) If not None, the text of each line is appended to it
+      for the verification of the module.
+
+  Returns:
+    The line number of the line after the block in the output file.
+  """
+  _AlignTrailingComments(final_lines)
+  formatted_lines, lineno = _FormatFinalLines(final_lines, lineno)
+  _UpdateWarnLocations(formatted_lines, messages)
 
-    if not processed_content:
-      final_lines_index += 1
+  text_lines = [
+      ''.join(value for value, _, _ in line) for line in formatted_lines
+  ]
+  if verified_lines is not None:
+    verified_lines.extend(text_lines)
+  write(''.join(text_lines))
+  return lineno
 
 
-def _FormatFinalLines(final_lines):
+def _FormatFinalLines(final_lines, lineno=1):
   """Compose the final output from the finalized lines and compute the
   actual line numbers for formatted lines in the output file.
+
+  Returns:
+    A tuple of the formatted lines and the line number after them.
   """
 
   formatted_lines = []
-  lineno = 1
 
   for line in final_lines:
     formatted_line = []
@@ -445,7 +526,7 @@ def _FormatFinalLines(final_lines):
 
     formatted_lines.append(formatted_line)
 
-  return formatted_lines
+  return formatted_lines, lineno
 
 
 def _UpdateWarnLocations(formatted_lines, messages):
@@ -455,19 +536,6 @@ def _UpdateWarnLocations(formatted_lines, messages):
             messages.set_location(tok, lineno)
 
 
-def _ToText(formatted_lines, verify):
-  def process_lines(lines):
-    for line in lines:
-      line = ''.join(value for value, _, _ in line)
-      if verify:
-        verifier.VerifyCode(line)
-      yield line
-
-  lines = process_lines(formatted_lines)
-  return ''.join(lines) + '\n'
-
-
-
 class _StateNode(object):
   """An edge in the solution space from 'previous.state' to 'state'.
 
@@ -545,8 +613,15 @@ def _AnalyzeSolutionSpace(initial_state):
 
     # FIXME(morbo): Add a 'decision' element?
 
-    count = _AddNextStateToQueue(penalty, node, False, count, p_queue)
-    count = _AddNextStateToQueue(penalty, node, True, count, p_queue)
+    must_split = node.state.MustSplit()
+    count = _AddNextStateToQueue(penalty, node, False, must_split, count,
+                                 p_queue)
+    if must_split:
+      # MustSplit() may change the state when it returns True, so it's asked
+      # again before adding the newline. Otherwise the answer is the same.
+      must_split = node.state.MustSplit()
+    count = _AddNextStateToQueue(penalty, node, True, must_split, count,
+                                 p_queue)
 
   if not p_queue:
     # We weren't able to find a solution. Do nothing.
@@ -556,7 +631,8 @@ def _AnalyzeSolutionSpace(initial_state):
   return True
 
 
-def _AddNextStateToQueue(penalty, previous_node, newline, count, p_queue):
+def _AddNextStateToQueue(penalty, previous_node, newline, must_split, count,
+                         p_queue):
   """Add the following state to the analysis queue.
 
   Assume the current state is 'previous_node' and has been reached with a
@@ -567,13 +643,13 @@ def _AddNextStateToQueue(penalty, previous_node, newline, count, p_queue):
     previous_node: (_StateNode) The last _StateNode inserted into the priority
       queue.
     newline: (bool) Add a newline if True.
+    must_split: (bool) The line must split before the next token.
     count: (int) The number of elements in the queue.
     p_queue: (heapq) The priority queue representing the solution space.
 
   Returns:
     The updated number of elements in the queue.
   """
-  must_split = previous_node.state.MustSplit()
   if newline and not previous_node.state.CanSplit(must_split):
     # Don't add a newline if the token cannot be split.
     return count
@@ -809,9 +885,7 @@ def _SingleOrMergedLines(uwlines):
           uwline.AppendToken(tok)
         index += 1
       yield uwline
-    elif line_joiner.CanMergeMultipleLines(uwlines[index:], last_was_merged):
-      # TODO(morbo): This splice is potentially very slow. Come up with a more
-      # performance-friendly way of determining if two lines can be merged.
+    elif line_joiner.CanMergeMultipleLines(uwlines, last_was_merged, index):
       next_uwline = uwlines[index + 1]
       for tok in next_uwline.tokens:
         uwlines[index].AppendToken(tok)
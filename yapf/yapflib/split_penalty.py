@@ -51,13 +51,37 @@ ONE_ELEMENT_ARGUMENT = 500
 SUBSCRIPT = 6000
 
 
-def ComputeSplitPenalties(tree):
+def ComputeSplitPenalties(tree, lines=None):
   """Compute split penalties on tokens in the given parse tree.
 
   Arguments:
     tree: the top-level pytree node to annotate with penalties.
+    lines: (line_ranges.LineRanges) The lines which can be modified or None if
+      there is no line range restriction. Top-level statements that don't
+      overlap these lines are emitted verbatim, so they don't need any split
+      penalties.
   """
-  _SplitPenaltyAssigner().Visit(tree)
+  assigner = _SplitPenaltyAssigner()
+  if not lines:
+    assigner.Visit(tree)
+    return
+
+  for child in tree.children:
+    if _StatementOverlapsLines(child, lines):
+      assigner.Visit(child)
+
+
+def _StatementOverlapsLines(node, lines):
+  """Return True if the top-level statement overlaps the lines.
+
+  The statement is assumed to extend up to the line before the following
+  statement, which errs on the side of computing penalties.
+  """
+  first = pytree_utils.FirstLeafNode(node).lineno
+  if node.next_sibling is None:
+    return lines.Overlaps(first, float('inf'))
+  last = max(first, pytree_utils.FirstLeafNode(node.next_sibling).lineno - 1)
+  return lines.Overlaps(first, last)
 
 
 class _SplitPenaltyAssigner(pytree_visitor.PyTreeVisitor):
@@ -19,6 +19,7 @@ import textwrap
 
 from yapf.yapflib import errors
 from yapf.yapflib import py3compat
+from yapf.yapflib.warnings import naming_styles
 
 
 class StyleConfigError(errors.YapfError):
@@ -180,6 +181,13 @@ _STYLE_HELP = dict(
       Indent width used for line continuations."""),
     COPYRIGHT_PATTERN=textwrap.dedent("""\
       A pattern used to detect the copyright docsring."""),
+    CUSTOM_NAMING_STYLES=textwrap.dedent("""\
+      Additional naming styles for the check_*_naming_style options, as
+      whitespace-separated name=regexp pairs. A name must match the whole
+      regexp. For example:
+
+          custom_naming_styles = upper_snake_case=[A-Z][A-Z0-9_]*$
+      """),
     DEDENT_CLOSING_BRACKETS=textwrap.dedent("""\
       Put closing brackets on a separate line, dedented, if the bracketed
       expression can't fit in a single line. Applies to all kinds of brackets,
@@ -247,6 +255,10 @@ _STYLE_HELP = dict(
       Indent blank lines."""),
     INSERT_SPACE_AFTER_HASH_CHAR=textwrap.dedent("""\
       Insert a missing space after the # char."""),
+    FIRST_PARTY_MODULES=textwrap.dedent("""\
+      A comma-separated list of the top-level packages (or modules) of the
+      project. SORT_IMPORTS puts their imports in a separate group after the
+      third-party ones."""),
     FIX_SHEBANG_HEADER=textwrap.dedent("""\
       Changing shebang to a more accurate format:
          !#/usr/bin/pythonX -> !#/usr/bin/env pythonX
@@ -292,6 +304,13 @@ _STYLE_HELP = dict(
     SHOULD_NOT_HAVE_WILDCARD_IMPORTS=textwrap.dedent("""\
       This option will enable warning that forces not to use wildcard imports
       (from module import *)"""),
+    SORT_IMPORTS=textwrap.dedent("""\
+      Sort the top-level imports and group them (separated by a blank line)
+      in the following order: __future__ imports, the standard library,
+      third-party modules, first-party modules (see FIRST_PARTY_MODULES) and
+      relative imports. Comments and other statements between the imports
+      are never moved, so the imports around them are sorted separately.
+      """),
     SPACES_AROUND_POWER_OPERATOR=textwrap.dedent("""\
       Use spaces around the power operator."""),
     SPACES_AROUND_DEFAULT_OR_NAMED_ASSIGN=textwrap.dedent("""\
@@ -492,12 +511,14 @@ def CreatePEP8Style():
       CONTINUATION_ALIGN_STYLE='SPACE',
       CONTINUATION_INDENT_WIDTH=4,
       COPYRIGHT_PATTERN='',
+      CUSTOM_NAMING_STYLES={},
       DEDENT_CLOSING_BRACKETS=False,
       INDENT_CLOSING_BRACKETS=False,
       DISABLE_ALL_WARNINGS=False,
       DISABLE_ENDING_COMMA_HEURISTIC=False,
       DISABLE_SPLITTING_BY_SEMICOLON=False,
       EACH_DICT_ENTRY_ON_SEPARATE_LINE=True,
+      FIRST_PARTY_MODULES=[],
       FIX_SHEBANG_HEADER=False,
       FORCE_LONG_LINES_WRAPPING=False,
       FORMAT_COPYRIGHT_DOC_STRING=False,
@@ -543,6 +564,7 @@ def CreatePEP8Style():
       USE_TABS=False,
       SHOULD_HAVE_ENCODING_HEADER=False,
       SHOULD_NOT_HAVE_WILDCARD_IMPORTS=False,
+      SORT_IMPORTS=False,
       WARN_BARE_EXCEPT_CLAUSES=False,
       WARN_INCORRECT_COMPARISON_WITH_NONE=False,
       WARN_LOST_EXCEPTIONS=False,
@@ -671,6 +693,8 @@ def _ContinuationAlignStyleStringConverter(s):
 
 def _StringListConverter(s):
   """Option value converter for a comma-separated list of strings."""
+  if len(s) > 2 and s[0] == s[-1] and s[0] in '"\'':
+    s = s[1:-1]
   return [part.strip() for part in s.split(',')]
 
 
@@ -703,18 +727,44 @@ def _IntOrIntListConverter(s):
 
 
 def _NamingStyleStringConverter(s):
-    accepted_styles = {'PASCALCASE', 'CAMELCASE', 'SNAKECASE', 'NONE'}
-
+    # whether the style exists is checked once all options are read, as it
+    # may be one of the CUSTOM_NAMING_STYLES (see _CheckNamingStyles())
     if s:
-        s = s.strip('"\'').replace('_', '').replace('-', '').upper()
+        s = naming_styles.normalize_style_name(s)
 
-        if s not in accepted_styles:
-            raise ValueError('unknown naming style: %s' % s)
+        if not re.match(r'\w+$', s):
+            raise ValueError('invalid naming style: %s' % s)
         if s != 'NONE':
             return s
 
     return None
 
+
+def _NamingStylesDictConverter(s):
+    """Option value converter for whitespace-separated name=regexp pairs."""
+    styles = dict()
+    for item in s.strip('"\'').split():
+        name, sep, pattern = item.partition('=')
+        if not (sep and name and pattern):
+            raise ValueError('invalid naming style: %s' % item)
+        try:
+            re.compile(pattern)
+        except re.error:
+            raise ValueError('invalid naming style regexp: %s' % pattern)
+        styles[naming_styles.normalize_style_name(name)] = pattern
+    return styles
+
+
+def _CheckNamingStyles(style):
+    """Raise StyleConfigError if a naming style check uses an unknown style."""
+    for option in ('CHECK_CLASS_NAMING_STYLE', 'CHECK_FUNC_NAMING_STYLE',
+                   'CHECK_MODULE_NAMING_STYLE', 'CHECK_VAR_NAMING_STYLE'):
+        name = style.get(option)
+        if (name and name not in naming_styles.NAMING_STYLES and
+                name not in style.get('CUSTOM_NAMING_STYLES', {})):
+            raise StyleConfigError(
+                "'{}' is not a valid setting for {}.".format(name, option))
+
 def _SimpleStringConverter(s):
     return s
 
@@ -749,6 +799,7 @@ _STYLE_OPTION_VALUE_CONVERTER = dict(
     CONTINUATION_ALIGN_STYLE=_ContinuationAlignStyleStringConverter,
     CONTINUATION_INDENT_WIDTH=int,
     COPYRIGHT_PATTERN=_SimpleStringConverter,
+    CUSTOM_NAMING_STYLES=_NamingStylesDictConverter,
     DEDENT_CLOSING_BRACKETS=_BoolConverter,
     INDENT_CLOSING_BRACKETS=_BoolConverter,
     DISABLE_ALL_WARNINGS=_BoolConverter,
@@ -766,11 +817,13 @@ _STYLE_OPTION_VALUE_CONVERTER = dict(
     NO_SPACES_AROUND_SELECTED_BINARY_OPERATORS=_StringSetConverter,
     SAVE_INITIAL_BLANKLINES=_BoolConverter,
     SAVE_INITIAL_INDENTS_FORMATTING=_BoolConverter,
+    FIRST_PARTY_MODULES=_StringListConverter,
     FIX_SHEBANG_HEADER=_BoolConverter,
     FORMAT_COPYRIGHT_DOC_STRING=_BoolConverter,
     FORMAT_LAST_QUOTE_DOC_STRING=_BoolConverter,
     SHOULD_HAVE_ENCODING_HEADER=_BoolConverter,
     SHOULD_NOT_HAVE_WILDCARD_IMPORTS=_BoolConverter,
+    SORT_IMPORTS=_BoolConverter,
     SPACE_BETWEEN_ENDING_COMMA_AND_CLOSING_BRACKET=_BoolConverter,
     SPACES_AROUND_POWER_OPERATOR=_BoolConverter,
     SPACES_AROUND_DEFAULT_OR_NAMED_ASSIGN=_BoolConverter,
@@ -942,6 +995,7 @@ def _CreateStyleFromConfigParser(config):
     except ValueError:
       raise StyleConfigError("'{}' is not a valid setting for {}.".format(
           value, option))
+  _CheckNamingStyles(base_style)
   return base_style
 
 
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Function: Unified diff of the original and the reformatted code
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+
+
+difflib.SequenceMatcher looks for the longest matching block of the whole
+remaining range over and over again, which gets slow on large files with many
+small changes. Reformatting keeps most lines unchanged and in their order, so
+the lines are matched the way "patience diff" does it: the common prefix and
+suffix are skipped, the lines occurring exactly once in both versions are used
+as anchors, and only the short gaps between the anchors are left to difflib.
+The hunks are written the same way as difflib.unified_diff writes them.
+"""
+
+import bisect
+import difflib
+
+
+def UnifiedDiff(before,
+                after,
+                fromfile='',
+                tofile='',
+                fromfiledate='',
+                tofiledate='',
+                n=3):
+    """ Yield the lines of the unified diff of two lists of lines.
+
+    The arguments and the lines are the same as the ones of
+    difflib.unified_diff with an empty lineterm.
+    """
+    started = False
+    for group in _GroupedOpcodes(_Opcodes(before, after), n):
+        if not started:
+            started = True
+            yield '--- {}{}'.format(fromfile, _FileDate(fromfiledate))
+            yield '+++ {}{}'.format(tofile, _FileDate(tofiledate))
+
+        first, last = group[0], group[-1]
+        yield '@@ -{} +{} @@'.format(_FormatRange(first[1], last[2]),
+                                     _FormatRange(first[3], last[4]))
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in before[i1:i2]:
+                    yield ' ' + line
+
+                continue
+
+            if tag in ('replace', 'delete'):
+                for line in before[i1:i2]:
+                    yield '-' + line
+
+            if tag in ('replace', 'insert'):
+                for line in after[j1:j2]:
+                    yield '+' + line
+
+
+def _FileDate(date):
+    return '\t{}'.format(date) if date else ''
+
+
+def _FormatRange(start, stop):
+    """ The 1-based range of the lines of a hunk, as difflib writes it."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return '{}'.format(beginning)
+
+    if not length:
+        beginning -= 1
+
+    return '{},{}'.format(beginning, length)
+
+
+def _Opcodes(a, b):
+    """ The (tag, i1, i2, j1, j2) opcodes turning a into b, see
+    difflib.SequenceMatcher.get_opcodes.
+    """
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in _MatchingBlocks(a, b):
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+
+        if size:
+            opcodes.append(('equal', ai, ai + size, bj, bj + size))
+
+        i, j = ai + size, bj + size
+
+    return opcodes
+
+
+def _GroupedOpcodes(opcodes, n):
+    """ The opcodes split into hunks with up to n lines of context, see
+    difflib.SequenceMatcher.get_grouped_opcodes.
+    """
+    if not opcodes:
+        opcodes = [('equal', 0, 1, 0, 1)]
+
+    if opcodes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = opcodes[0]
+        opcodes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+
+    if opcodes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = opcodes[-1]
+        opcodes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # a long range without changes ends the hunk
+        if tag == 'equal' and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+
+        group.append((tag, i1, i2, j1, j2))
+
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _MatchingBlocks(a, b):
+    """ The (i, j, size) blocks of equal lines, merged where they're adjacent
+    and ending with the (len(a), len(b), 0) sentinel, see
+    difflib.SequenceMatcher.get_matching_blocks.
+    """
+    blocks = []
+    _MatchRange(a, b, 0, len(a), 0, len(b), blocks, anchored=True)
+
+    merged = []
+    for i, j, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and (
+                merged[-1][1] + merged[-1][2] == j):
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + size)
+
+        elif size:
+            merged.append((i, j, size))
+
+    merged.append((len(a), len(b), 0))
+    return merged
+
+
+def _Anchors(a, b, alo, ahi, blo, bhi):
+    """ The (i, j) pairs of the lines occurring exactly once in both a[alo:ahi]
+    and b[blo:bhi], the longest sequence of them which is in order in both.
+    """
+    counts = {}
+    for i in range(alo, ahi):
+        line = a[i]
+        counts[line] = -1 if line in counts else i
+
+    positions = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if counts.get(line, -1) >= 0:
+            positions[line] = -1 if line in positions else j
+
+    pairs = [(counts[line], j) for line, j in positions.items() if j >= 0]
+    pairs.sort()
+
+    # patience sorting: the longest increasing sequence of the positions in b
+    tails = []  # the last j of the best sequence of each length
+    tail_indexes = []
+    previous = []
+    last = -1  # the end of the first sequence of the maximum length
+    for index, (_, j) in enumerate(pairs):
+        length = bisect.bisect_left(tails, j)
+        if length == len(tails):
+            tails.append(j)
+            tail_indexes.append(index)
+            last = index
+
+        else:
+            tails[length] = j
+            tail_indexes[length] = index
+
+        previous.append(tail_indexes[length - 1] if length else -1)
+
+    anchors = []
+    index = last
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+
+    anchors.reverse()
+    return anchors
+
+
+def _MatchRange(a, b, alo, ahi, blo, bhi, blocks, anchored=False):
+    """ Append the matching blocks of a[alo:ahi] and b[blo:bhi] to blocks.
+
+    If anchored, the range is split at its unique lines first, and the gaps
+    between them are matched by difflib.
+    """
+    start = alo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+
+    blocks.append((start, blo - (alo - start), alo - start))
+
+    end = ahi
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+
+    suffix = (ahi, bhi, end - ahi)
+
+    if alo < ahi and blo < bhi:
+        anchors = _Anchors(a, b, alo, ahi, blo, bhi) if anchored else []
+        if anchors:
+            for anchor_i, anchor_j in anchors:
+                _MatchRange(a, b, alo, anchor_i, blo, anchor_j, blocks)
+                blocks.append((anchor_i, anchor_j, 1))
+                alo, blo = anchor_i + 1, anchor_j + 1
+
+            _MatchRange(a, b, alo, ahi, blo, bhi, blocks)
+
+        else:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi])
+            for i, j, size in matcher.get_matching_blocks():
+                blocks.append((alo + i, blo + j, size))
+
+    blocks.append(suffix)
@@ -60,6 +60,19 @@ class UnwrappedLine(object):
 
   def CalculateFormattingInformation(self):
     """Calculate the split penalty and total length for the tokens."""
+    self._CalculateFormattingInformation(breaks=True)
+
+  def CalculateUnformattedInformation(self):
+    """Calculate the formatting information of a line that isn't reformatted.
+
+    The line is emitted with its original line breaks (see
+    reformatter._EmitLineUnformatted), so only the spacing and the total
+    length of the tokens are calculated; the split penalties aren't added to
+    and no break is required or allowed before any token.
+    """
+    self._CalculateFormattingInformation(breaks=False)
+
+  def _CalculateFormattingInformation(self, breaks):
     # Say that the first token in the line should have a space before it. This
     # means only that if this unwrapped line is joined with a predecessor line,
     # then there will be a space between them.
@@ -89,12 +102,16 @@ class UnwrappedLine(object):
 
       token.total_length = prev_length + tok_len + spaces_required_before
 
-      # The split penalty has to be computed before {must|can}_break_before,
-      # because these may use it for their decision.
-      token.split_penalty += _SplitPenalty(prev_token, token)
-      token.must_break_before = _MustBreakBefore(prev_token, token)
-      token.can_break_before = (
-          token.must_break_before or _CanBreakBefore(prev_token, token))
+      if breaks:
+        # The split penalty has to be computed before {must|can}_break_before,
+        # because these may use it for their decision.
+        token.split_penalty += _SplitPenalty(prev_token, token)
+        token.must_break_before = _MustBreakBefore(prev_token, token)
+        token.can_break_before = (
+            token.must_break_before or _CanBreakBefore(prev_token, token))
+      else:
+        token.must_break_before = False
+        token.can_break_before = False
 
       prev_length = token.total_length
       prev_token = token
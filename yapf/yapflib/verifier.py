@@ -13,13 +13,18 @@
 # limitations under the License.
 """Verify that the generated code is valid code.
 
-This takes a line of code and "normalizes" it. I.e., it transforms the snippet
-into something that has the potential to compile.
+The whole reformatted module is compiled at once. Only if that fails, each
+line of code is "normalized" and verified on its own to find the one that was
+reformatted incorrectly. I.e., the snippet is transformed into something that
+has the potential to compile.
 
-    VerifyCode(): the main function exported by this module.
+    VerifyModule(): verify the whole reformatted module.
+    VerifyEquivalence(): verify that reformatting didn't change the module's AST.
+    VerifyCode(): verify a single reformatted line of code.
 """
 
 import ast
+import itertools
 import re
 import sys
 import textwrap
@@ -30,6 +35,164 @@ class InternalError(Exception):
   pass
 
 
+class EquivalenceError(InternalError):
+  """The reformatted code doesn't mean the same as the original code.
+
+  Attributes:
+    paths: (list of str) The paths of the AST nodes that differ, e.g.
+      'Module.body[2].value.args[0]'.
+  """
+
+  def __init__(self, paths):
+    super(EquivalenceError, self).__init__(
+        'reformatted code is not equivalent to the original: ' +
+        ', '.join(paths[:_MAX_REPORTED_PATHS]))
+    self.paths = paths
+
+
+# The number of mismatching node paths reported in an EquivalenceError message.
+_MAX_REPORTED_PATHS = 10
+
+
+def VerifyModule(code, lines=None):
+  """Verify that the reformatted module is syntactically correct.
+
+  Arguments:
+    code: (unicode) The reformatted module.
+    lines: (list of unicode) The reformatted lines making up the module. They
+      are only verified one by one to localize a syntax error in the module.
+
+  Returns:
+    The module's AST.
+
+  Raises:
+    InternalError if the code was reformatted incorrectly.
+  """
+  try:
+    return ast.parse(code, '<string>', 'exec')
+  except SyntaxError:
+    error = sys.exc_info()[1]
+
+  for line in lines or []:
+    VerifyCode(line)
+  raise InternalError(error)
+
+
+def VerifyEquivalence(original_code,
+                      reformatted_code,
+                      split_imports=False,
+                      hoist_imports=False,
+                      sort_imports=False):
+  """Verify that the reformatted module has the same AST as the original one.
+
+  Both modules are parsed once and normalized before they are compared, so that
+  the whitespace in docstrings (and other string statements) is ignored. Nothing
+  is verified if the original code can't be parsed by the running interpreter
+  (e.g., Python 2 code formatted by Python 3).
+
+  Arguments:
+    original_code: (unicode) The original module.
+    reformatted_code: (unicode) The reformatted module.
+    split_imports: (bool) Treat 'import a, b' the same as separate imports.
+    hoist_imports: (bool) Ignore the order of the top-level imports and of the
+      string statements (i.e., the copyright docstring) that precede the code.
+    sort_imports: (bool) Ignore the order of consecutive top-level imports.
+
+  Raises:
+    InternalError if the reformatted code isn't valid code.
+    EquivalenceError if reformatting changed the meaning of the code.
+  """
+  try:
+    original_tree = ast.parse(original_code, '<string>', 'exec')
+  except SyntaxError:
+    return
+
+  reformatted_tree = VerifyModule(reformatted_code)
+  for tree in (original_tree, reformatted_tree):
+    _NormalizeTree(tree, split_imports, hoist_imports, sort_imports)
+
+  paths = []
+  _CompareNodes(original_tree, reformatted_tree, 'Module', paths)
+  if paths:
+    raise EquivalenceError(paths)
+
+
+def _NormalizeTree(tree, split_imports, hoist_imports, sort_imports):
+  """Normalize the AST in place, erasing the differences fixers may make."""
+  for node in ast.walk(tree):
+    body = getattr(node, 'body', None)
+    if not isinstance(body, list):
+      continue
+
+    for stmt in body:
+      field = _StringStatementField(stmt)
+      if field:
+        value = getattr(stmt.value, field)
+        setattr(stmt.value, field,
+                '\n'.join(line.strip() for line in value.strip().splitlines()))
+
+    if split_imports:
+      body[:] = [
+          split_stmt for stmt in body for split_stmt in (
+              [ast.Import(names=[name]) for name in stmt.names]
+              if isinstance(stmt, ast.Import) else [stmt])
+      ]
+
+  if hoist_imports:
+    header_length = 0
+    for stmt in tree.body:
+      if not (_StringStatementField(stmt) or _IsImport(stmt)):
+        break
+      header_length += 1
+
+    def Rank(index):
+      stmt = tree.body[index]
+      if index < header_length and _StringStatementField(stmt):
+        return 0
+      return 1 if _IsImport(stmt) else 2
+
+    order = sorted(range(len(tree.body)), key=Rank)
+    tree.body[:] = [tree.body[index] for index in order]
+
+  if sort_imports:
+    body = []
+    for is_import, stmts in itertools.groupby(tree.body, _IsImport):
+      body.extend(sorted(stmts, key=ast.dump) if is_import else stmts)
+    tree.body[:] = body
+
+
+def _StringStatementField(stmt):
+  """Return the field holding the string of a string statement, or None."""
+  if isinstance(stmt, ast.Expr):
+    for field in ('value', 's'):  # ast.Constant and ast.Str respectively.
+      if isinstance(getattr(stmt.value, field, None), str):
+        return field
+  return None
+
+
+def _IsImport(stmt):
+  return isinstance(stmt, (ast.Import, ast.ImportFrom))
+
+
+def _CompareNodes(left, right, path, paths):
+  """Collect the paths of the nodes that differ between the two ASTs."""
+  if type(left) is not type(right):
+    paths.append(path)
+  elif isinstance(left, ast.AST):
+    for field in left._fields:
+      _CompareNodes(
+          getattr(left, field, None), getattr(right, field, None),
+          '{0}.{1}'.format(path, field), paths)
+  elif isinstance(left, list):
+    if len(left) != len(right):
+      paths.append(path)
+    for index, (left_item, right_item) in enumerate(zip(left, right)):
+      _CompareNodes(left_item, right_item, '{0}[{1}]'.format(path, index),
+                    paths)
+  elif left != right:
+    paths.append(path)
+
+
 def VerifyCode(code):
   """Verify that the reformatted code is syntactically correct.
 
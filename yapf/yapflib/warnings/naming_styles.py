@@ -9,27 +9,106 @@ Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010
 #    camelCase
 #    snake_case
 #
+# Besides the built-in styles, users can define their own ones in the style
+# config (see CUSTOM_NAMING_STYLES), which apply to all kinds of names.
+#
 import re
 
-REGEXPS = dict(
-    classname=dict(
-        PASCALCASE=re.compile(r'[A-Z_][a-zA-Z0-9]+$'),
-        CAMELCASE=re.compile(r'[a-z_][a-zA-Z0-9]+$'),
-        SNAKECASE=re.compile(r'[a-z_][a-z0-9_]+$'),
-    ),
-    funcname=dict(
-        PASCALCASE=re.compile(r'((_{0,2}[A-Z][a-zA-Z0-9]+)|(__.*__))$'),
-        CAMELCASE=re.compile(r'((_{0,2}[a-z][a-zA-Z0-9]+)|(__.*__))$'),
-        SNAKECASE=re.compile(r'((_{0,2}[a-z][a-z0-9_]+)|(__.*__))$'),
-    ),
-    modname=dict(
-        PASCALCASE=re.compile(r'[A-Z_][a-zA-Z0-9]+$'),
-        CAMELCASE=re.compile(r'[a-z_][a-zA-Z0-9]+$'),
-        SNAKECASE=re.compile(r'[a-z_][a-z0-9_]+$'),
-    ),
-    varname=dict(
-        PASCALCASE=re.compile(r'((_{0,2}[A-Z][a-zA-Z0-9]*)|(__.*__)|([_*]))$'),
-        CAMELCASE=re.compile(r'((_{0,2}[a-z][a-zA-Z0-9]*)|(__.*__)|([_*]))$'),
-        SNAKECASE=re.compile(r'((_{0,2}[a-z][a-z0-9_]*)|(__.*__)|([_*]))$'),
-    ),
-)
+from yapf.yapflib import py3compat
+
+# the number of names whose check results are kept per naming style
+_MATCH_CACHE_SIZE = 4096
+
+
+class NamingStyle:
+    """ A compiled naming style. The same names (e.g. `self` or common local
+    variables) are checked over and over, so the results are memoized.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.__regexp = re.compile(pattern)
+        self.match = py3compat.lru_cache(maxsize=_MATCH_CACHE_SIZE)(
+            self.__match)
+
+    def __match(self, name):
+        return self.__regexp.match(name) is not None
+
+    def __repr__(self):
+        return 'NamingStyle(%r)' % self.pattern
+
+
+@py3compat.lru_cache(maxsize=None)
+def _compile(pattern):
+    """ Compile each pattern once per process (i.e. for all the files)."""
+    return NamingStyle(pattern)
+
+
+def normalize_style_name(style_name):
+    """ 'snake_case', 'Snake-Case' and 'SNAKECASE' are the same style."""
+    return style_name.strip('"\'').replace('_', '').replace('-', '').upper()
+
+
+class NamingStyleRegistry:
+    """ Naming styles by the kind of names they apply to."""
+
+    KINDS = ('classname', 'funcname', 'modname', 'varname')
+
+    def __init__(self):
+        self.__patterns = {kind: dict() for kind in self.KINDS}
+
+    def register(self, style_name, patterns):
+        """ Add (or replace) a naming style. `patterns` is a regexp for all
+        kinds of names, or a dict with a regexp per kind.
+        """
+
+        if not isinstance(patterns, dict):
+            patterns = dict.fromkeys(self.KINDS, patterns)
+
+        style_name = normalize_style_name(style_name)
+        for kind, pattern in patterns.items():
+            self.__patterns[kind][style_name] = pattern
+
+    def __contains__(self, style_name):
+        return any(
+            style_name in patterns for patterns in self.__patterns.values())
+
+    def get(self, kind, style_name, custom_styles=None):
+        """ Return the NamingStyle for a kind of names. The custom styles
+        (a dict of regexps) take precedence over the registered ones.
+        """
+
+        if custom_styles and style_name in custom_styles:
+            return _compile(custom_styles[style_name])
+
+        return _compile(self.__patterns[kind][style_name])
+
+
+NAMING_STYLES = NamingStyleRegistry()
+
+NAMING_STYLES.register(
+    'PASCALCASE',
+    dict(
+        classname=r'[A-Z_][a-zA-Z0-9]+$',
+        funcname=r'((_{0,2}[A-Z][a-zA-Z0-9]+)|(__.*__))$',
+        modname=r'[A-Z_][a-zA-Z0-9]+$',
+        varname=r'((_{0,2}[A-Z][a-zA-Z0-9]*)|(__.*__)|([_*]))$',
+    ))
+
+NAMING_STYLES.register(
+    'CAMELCASE',
+    dict(
+        classname=r'[a-z_][a-zA-Z0-9]+$',
+        funcname=r'((_{0,2}[a-z][a-zA-Z0-9]+)|(__.*__))$',
+        modname=r'[a-z_][a-zA-Z0-9]+$',
+        varname=r'((_{0,2}[a-z][a-zA-Z0-9]*)|(__.*__)|([_*]))$',
+    ))
+
+NAMING_STYLES.register(
+    'SNAKECASE',
+    dict(
+        classname=r'[a-z_][a-z0-9_]+$',
+        funcname=r'((_{0,2}[a-z][a-z0-9_]+)|(__.*__))$',
+        modname=r'[a-z_][a-z0-9_]+$',
+        varname=r'((_{0,2}[a-z][a-z0-9_]*)|(__.*__)|([_*]))$',
+    ))
@@ -1,3 +1,4 @@
+import collections
 import json
 import os
 import sys
@@ -66,10 +67,33 @@ WARNINGS_DESCRIPTION = {
 }
 
 
+# formats of the warnings report, see `write_report()`
+OUTPUT_FORMATS = ('jsonl', 'json', 'sarif', 'summary')
+
+
+class _LineText:
+    """ The text of an unwrapped line as it was when a message was added (see
+    `UnwrappedLine.AsCode()`), which is joined when it's called.
+    """
+
+    __slots__ = ('depth', 'values')
+
+    def __init__(self, line):
+        self.depth = line.depth
+        self.values = tuple(tok.value for tok in line.tokens)
+
+    def __call__(self):
+        return ' ' * 2 * self.depth + ' '.join(self.values)
+
+
 class Messages:
     """Contains warnings and their locations. The `set_location()` method
     allows to generate correctly foramtted messages that refer to the correct
     position in the output file.
+
+    Nothing is rendered when a message is added: the values of the tokens of
+    the line are kept and joined only when the messages are output, and the
+    keyword arguments may be callables, which are called then as well.
     """
     # in case your warning is not related with any line this constant should
     # be used in "content" field for explicitly marking it
@@ -92,9 +116,15 @@ class Messages:
 
     def add(self, anchor, line, warn, **kwargs):
         """ Add a message connected to an achor (i.e. some object representing
-        some entity in the source file).
+        some entity in the source file). `line` is the text of the line with
+        the warning, or the unwrapped line itself.
         """
 
+        if not isinstance(line, str):
+            # the line may still be changed (e.g. joined with the next one)
+            # before the messages are output
+            line = _LineText(line)
+
         self.add_anchor(anchor)
         msg = self.Message(warn, anchor, line, kwargs)
         self.messages.append(msg)
@@ -113,20 +143,36 @@ class Messages:
     def __contains__(self, anchor):
         return anchor in self.anchor_locations
 
+    def __len__(self):
+        return len(self.messages)
+
     def set_location(self, anchor, lineno):
         """ Set the line number of an anchor."""
 
         self.anchor_locations[anchor] = lineno
 
-    def show(self):
+    def set_source_locations(self):
+        """ Locate the anchors which have no location yet at their line in
+        the original source, for the case when the code is not reformatted.
+        """
+
+        for anchor, lineno in self.anchor_locations.items():
+            if lineno is None:
+                self.anchor_locations[anchor] = anchor.lineno
+
+    def show(self, output_format='jsonl', stream=None):
         """ Print out all saved messages."""
 
+        write_report([self], output_format, stream)
+
+    def render(self):
+        """ Return the messages as dicts sorted by the line number."""
+
         messages = sorted(self.messages,
                           key=lambda m: self.get_lineno(m.anchor))
-        for msg in messages:
-            sys.stderr.write('%s\n' % self.__format_msg(msg))
+        return [self.__render_msg(msg) for msg in messages]
 
-    def __format_msg(self, msg):
+    def __render_msg(self, msg):
         def apply_callable(value):
             if callable(value):
                 return value()
@@ -144,12 +190,87 @@ class Messages:
 
         warn_dict['message'] = f'{WARNINGS_DESCRIPTION[msg.warn]}'.format(**kwargs)
         if lineno != -1:
-            warn_dict['warnline'] = msg.line
+            warn_dict['warnline'] = apply_callable(msg.line)
         else:
             warn_dict['content'] = self.NA
-        # sorting keys here to make output more deterministic
-        return json.dumps(warn_dict, sort_keys=True)
+        return warn_dict
 
     def get_lineno(self, anchor):
         """ Return the location of an anchor."""
         return self.anchor_locations[anchor]
+
+
+def write_report(all_messages, output_format='jsonl', stream=None):
+    """ Render the messages of one or more files and write them in a single
+    write (to stderr by default). `all_messages` holds `Messages` or lists of
+    already rendered messages (e.g. returned by parallel workers), which are
+    merged, deduplicated and sorted by the file and the line number.
+
+    Formats:
+        jsonl   - one JSON object per message and line,
+        json    - one JSON array of all the messages,
+        sarif   - a SARIF 2.1.0 log with one run,
+        summary - one JSON object with the number of messages per warning.
+    """
+
+    warn_dicts = []
+    seen = set()
+    for messages in all_messages:
+        if isinstance(messages, Messages):
+            messages = messages.render()
+        for warn_dict in messages:
+            key = tuple(sorted(warn_dict.items()))
+            if key not in seen:
+                seen.add(key)
+                warn_dicts.append(warn_dict)
+
+    # the messages of a file are already sorted, the sort is stable
+    warn_dicts.sort(key=lambda w: (w['filename'], w.get('lineno', -1)))
+
+    # sorting keys here to make output more deterministic
+    if output_format == 'jsonl':
+        report = ''.join('%s\n' % json.dumps(warn_dict, sort_keys=True)
+                         for warn_dict in warn_dicts)
+    elif output_format == 'json':
+        report = '%s\n' % json.dumps(warn_dicts, sort_keys=True)
+    elif output_format == 'sarif':
+        report = '%s\n' % json.dumps(_to_sarif(warn_dicts), sort_keys=True)
+    elif output_format == 'summary':
+        counts = collections.Counter(Warnings(w['WARN']).name
+                                     for w in warn_dicts)
+        report = '%s\n' % json.dumps(counts, sort_keys=True)
+    else:
+        raise ValueError('unknown warnings format: %s' % output_format)
+
+    if report:
+        (stream or sys.stderr).write(report)
+
+
+def _to_sarif(warn_dicts):
+    rules = sorted({Warnings(warn_dict['WARN']) for warn_dict in warn_dicts},
+                   key=lambda warn: warn.value)
+
+    results = []
+    for warn_dict in warn_dicts:
+        location = {'artifactLocation': {'uri': warn_dict['filename']}}
+        if 'lineno' in warn_dict:
+            location['region'] = {'startLine': warn_dict['lineno']}
+
+        results.append({
+            'ruleId': Warnings(warn_dict['WARN']).name,
+            'level': 'warning',
+            'message': {'text': warn_dict['message']},
+            'locations': [{'physicalLocation': location}],
+        })
+
+    return {
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'yapf',
+                'rules': [{'id': warn.name} for warn in rules],
+            }},
+            'results': results,
+        }],
+    }
@@ -13,7 +13,7 @@ from lib2to3 import pytree
 from lib2to3.pgen2 import token
 from lib2to3.pygram import python_symbols as syms
 
-from yapf.yapflib.warnings.naming_styles import REGEXPS
+from yapf.yapflib.warnings.naming_styles import NAMING_STYLES
 from yapf.yapflib.warnings.warn_msg import Messages, Warnings
 from .. import pytree_utils, pytree_visitor
 from ..fixers.fix_copyright_doc_string import get_copyright_doc_string
@@ -21,17 +21,17 @@ from ..fixers.fix_copyright_doc_string import get_copyright_doc_string
 encoding_regex = re.compile('^[ \t\f]*#.*?coding[:=][ \t]*([-_.a-zA-Z0-9]+)')
 
 
-def check_all_recommendations(uwlines, style, filename):
-    # FixMe: will need to reduce the number of usages of this method when chosen
-    # FixME: style does not need these warnings (affecting performance)
+def check_all_recommendations(uwlines, style, filename, lines=None):
+    """ Run all enabled checkers over the unwrapped lines.
 
+    When `lines` (line_ranges.LineRanges) is given, only the lines that overlap
+    it are checked. The stateful checkers still see every line, so that they
+    know the context of the lines being checked.
+    """
     messages = Messages(filename)
     if style.Get('DISABLE_ALL_WARNINGS'):
         return messages
 
-    warn_redefinition = RedefenitionChecker()
-    warn_not_properly_encapsulated = ScriptsCodeIncapsulationChecker()
-
     modname = os.path.splitext(os.path.basename(filename))[0]
 
     warn_module_naming_style(messages, modname, style)
@@ -39,26 +39,157 @@ def check_all_recommendations(uwlines, style, filename):
     warn_missing_copyright(messages, modname, uwlines, style)
     incorrect_order_of_doc(messages, modname, uwlines, style)
 
-    prev_line = None
-    for line in uwlines:
-        warn_wildcard_imports(messages, line, style)
-        warn_if_global_vars_not_commented(messages, line, prev_line, style)
-        warn_class_naming_style(messages, line, style)
-        warn_func_naming_style(messages, line, style)
-        warn_vars_naming_style(messages, line, style)
-        warn_redefinition(messages, line, style)
-        warn_incorrect_comparison_with_none(messages, line, style)
-        warn_not_properly_encapsulated(line, prev_line, style)
-        warn_bare_except_clauses(messages, line, style)
-        warn_lost_exception(messages, line, style)
-        warn_misplaced_bare_raise(messages, line, style)
-        prev_line = line
-
-    warn_not_properly_encapsulated.end(messages)
+    CheckerEngine(style, uwlines).run(messages, uwlines, lines)
 
     return messages
 
 
+class CheckerEngine:
+    """ Run the enabled per-line checkers in a single pass over the lines.
+
+    Each checker registers interest in the values of the first token of a
+    line (e.g. the `except` keyword) or of any of its tokens (e.g. `==`),
+    and is called for those lines or tokens only. The enabled checkers and
+    their options are resolved from the style once, when the engine is
+    created, instead of on every line.
+
+    Checkers are called for a line in the order of registration:
+        - line checkers: `checker(messages, line, prev_line)`,
+        - token checkers: `checker(messages, line, tok)`,
+        - stateful checkers: `checker(messages, line, report)`.
+    The stateful checkers see every line (so that they know the context of
+    the lines being checked), the others see only the lines in range.
+    """
+
+    def __init__(self, style, uwlines):
+        self.every_line_checkers = []
+        self.line_checkers = dict()
+        self.token_checkers = dict()
+        self.stateful_checkers = dict()
+        self.finalizers = []
+
+        if style.Get('SHOULD_NOT_HAVE_WILDCARD_IMPORTS'):
+            self.on_token(warn_wildcard_imports, 'import')
+
+        if style.Get('WARN_NOT_COMMENTED_GLOBAL_VARS'):
+            self.on_line(warn_if_global_vars_not_commented)
+
+        naming_style = _get_naming_style(style, 'CHECK_CLASS_NAMING_STYLE',
+                                         'classname')
+        if naming_style:
+            self.on_line(partial(warn_class_naming_style,
+                                 naming_style=naming_style), 'class')
+
+        naming_style = _get_naming_style(style, 'CHECK_FUNC_NAMING_STYLE',
+                                         'funcname')
+        if naming_style:
+            self.on_line(partial(warn_func_naming_style,
+                                 naming_style=naming_style), 'def')
+
+        naming_style = _get_naming_style(style, 'CHECK_VAR_NAMING_STYLE',
+                                         'varname')
+        if naming_style:
+            self.on_line(partial(warn_vars_naming_style,
+                                 naming_style=naming_style))
+            self.on_line(partial(warn_args_naming_style,
+                                 naming_style=naming_style), 'def')
+
+        if style.Get('WARN_INCORRECT_COMPARISON_WITH_NONE'):
+            self.on_token(warn_incorrect_comparison_with_none, '==', '!=')
+
+        if style.Get('WARN_BARE_EXCEPT_CLAUSES'):
+            self.on_line(warn_bare_except_clauses, 'except')
+
+        if style.Get('WARN_LOST_EXCEPTIONS'):
+            self.on_line(warn_lost_exception, 'return', 'break')
+
+        if style.Get('WARN_MISPLACED_BARE_RAISE'):
+            self.on_line(warn_misplaced_bare_raise, 'raise')
+
+        self.scopes = None
+        if style.Get('WARN_REDEFINITION'):
+            self.scopes = ScopeIndex()
+            self.on_line_stateful(RedefenitionChecker(self.scopes),
+                                  'def', 'class')
+
+        if style.Get('CHECK_SCRIPT_CODE_ENCAPSULATION'):
+            checker = ScriptsCodeIncapsulationChecker(uwlines)
+            if checker.can_be_executed:
+                self.on_line_stateful(checker, 'if')
+                self.finalizers.append(checker.end)
+
+    def on_line(self, checker, *values):
+        """ Call the checker for the lines starting with one of the values,
+        or for every line if no value is given.
+        """
+
+        if not values:
+            self.every_line_checkers.append(checker)
+        for value in values:
+            self.line_checkers.setdefault(value, []).append(checker)
+
+    def on_token(self, checker, *values):
+        """ Call the checker for every token with one of the values."""
+
+        for value in values:
+            self.token_checkers.setdefault(value, []).append(checker)
+
+    def on_line_stateful(self, checker, *values):
+        """ Call the checker for all the lines starting with one of the
+        values, including the lines out of range.
+        """
+
+        for value in values:
+            self.stateful_checkers.setdefault(value, []).append(checker)
+
+    def run(self, messages, uwlines, lines=None):
+        prev_line = None
+        for line in uwlines:
+            if not line.tokens:
+                continue
+
+            first_value = line.first.value
+            in_range = _is_in_lines(line, lines)
+            if in_range:
+                for checker in self.every_line_checkers:
+                    checker(messages, line, prev_line)
+
+                for checker in self.line_checkers.get(first_value, ()):
+                    checker(messages, line, prev_line)
+
+                if self.token_checkers:
+                    for tok in line.tokens:
+                        for checker in self.token_checkers.get(tok.value, ()):
+                            checker(messages, line, tok)
+
+            if self.scopes is not None:
+                self.scopes.update(line)
+
+            for checker in self.stateful_checkers.get(first_value, ()):
+                checker(messages, line, in_range)
+
+            prev_line = line
+
+        for finalize in self.finalizers:
+            finalize(messages)
+
+
+def _get_naming_style(style, option, kind):
+    """ Return the naming style the option is set to, or None."""
+
+    naming_style_name = style.Get(option)
+    if not naming_style_name:
+        return None
+    return NAMING_STYLES.get(kind, naming_style_name,
+                             style.Get('CUSTOM_NAMING_STYLES'))
+
+
+def _is_in_lines(line, lines):
+    if not lines:
+        return True
+    return lines.Overlaps(line.lineno, line.last.lineno)
+
+
 def check_first_lines(messages, uwlines, style):
     if len(uwlines) >= 1:
         first_line = uwlines[0]
@@ -69,16 +200,11 @@ def check_first_lines(messages, uwlines, style):
 
 # wildcard imports should not be used in code
 # WARN: WILDCARD_IMPORT
-# Control option: SHOULD_HAVE_ENCODING_HEADER
-def warn_wildcard_imports(messages, line, style):
-    if not style.Get('SHOULD_NOT_HAVE_WILDCARD_IMPORTS'):
-        return
-
-    for tok in line.tokens:
-        next_token = tok.next_token
-        if tok.is_import_keyword and next_token.node.type == token.STAR:
-            messages.add(tok, line.AsCode(), Warnings.WILDCARD_IMPORT)
-            break
+# Control option: SHOULD_NOT_HAVE_WILDCARD_IMPORTS
+def warn_wildcard_imports(messages, line, tok):
+    next_token = tok.next_token
+    if tok.is_import_keyword and next_token.node.type == token.STAR:
+        messages.add(tok, line, Warnings.WILDCARD_IMPORT)
 
 
 encoding_regex = re.compile('^[ \t\f]*#.*?coding[:=][ \t]*([-_.a-zA-Z0-9]+)')
@@ -95,7 +221,7 @@ def warn_if_no_encoding(messages, first_line, style):
             if is_comment_with_encoding(all_comments, first_token.lineno):
                 return
 
-        messages.add(first_token, first_line.AsCode(), Warnings.ENCODING)
+        messages.add(first_token, first_line, Warnings.ENCODING)
 
 
 def empty_newlines_in_the_beginning(lineno, comments):
@@ -120,9 +246,9 @@ def is_comment_with_encoding(comments, lineno):
 def _is_global_var_definition(uwl):
     return (uwl.depth == 0
             and uwl.tokens
-            and pytree_utils.NodeName(uwl.first.node.parent) == 'expr_stmt'
-            and uwl.first.is_name
             and uwl.first.value.isupper()
+            and uwl.first.is_name
+            and pytree_utils.NodeName(uwl.first.node.parent) == 'expr_stmt'
             )
 
 
@@ -154,13 +280,10 @@ def _is_comment_line(uwl):
     return True
 
 
-def warn_if_global_vars_not_commented(messages, uwl, prev, style):
-    if not style.Get('WARN_NOT_COMMENTED_GLOBAL_VARS'):
-        return
-
+def warn_if_global_vars_not_commented(messages, uwl, prev):
     if (_is_global_var_definition(uwl)
             and (prev is None or not _is_comment_line(prev))):
-        messages.add(uwl.first, uwl.AsCode(), Warnings.GLOBAL_VAR_COMMENT,
+        messages.add(uwl.first, uwl, Warnings.GLOBAL_VAR_COMMENT,
                      variable=uwl.first.value)
 
 
@@ -171,58 +294,46 @@ def get_str_with_encoding(comments_str, lineno):
     )
 
 
-def warn_class_naming_style(messages, line, style):
+def warn_class_naming_style(messages, line, prev_line, naming_style):
     """ Check if class names fit the naming rule."""
 
-    naming_style_name = style.Get('CHECK_CLASS_NAMING_STYLE')
-    if not naming_style_name:
-        return
-
     def get_classname(uwl):
         tok = next(filter(lambda t: t.name == 'NAME', uwl.tokens[1:]))
         return tok
 
-    if line.tokens and line.is_class_definition:
-        naming_style = REGEXPS['classname'][naming_style_name]
-
+    if line.is_class_definition:
         classname_tok = get_classname(line)
         if not naming_style.match(classname_tok.value):
-            messages.add(classname_tok, line.AsCode(), Warnings.CLASS_NAMING_STYLE,
+            messages.add(classname_tok, line, Warnings.CLASS_NAMING_STYLE,
                          classname=classname_tok.value)
 
 
-def warn_func_naming_style(messages, line, style):
+def warn_func_naming_style(messages, line, prev_line, naming_style):
     """ Check if function (member or not) names fit the naming rule."""
 
-    naming_style_name = style.Get('CHECK_FUNC_NAMING_STYLE')
-    if not naming_style_name:
-        return
-
     def get_funcname(uwl):
         tok = next(filter(lambda t: t.name == 'NAME', uwl.tokens[1:]))
         return tok
 
-    if line.tokens and line.is_func_definition:
-        naming_style = REGEXPS['funcname'][naming_style_name]
-
+    if line.is_func_definition:
         funcname_tok = get_funcname(line)
         if not naming_style.match(funcname_tok.value):
-            messages.add(funcname_tok, line.AsCode(), Warnings.FUNC_NAMING_STYLE,
+            messages.add(funcname_tok, line, Warnings.FUNC_NAMING_STYLE,
                          funcname=funcname_tok.value)
 
 
 def warn_module_naming_style(messages, modname, style):
     """ Check if module names fit the naming rule."""
 
-    naming_style_name = style.Get('CHECK_MODULE_NAMING_STYLE')
-    if not naming_style_name:
+    naming_style = _get_naming_style(style, 'CHECK_MODULE_NAMING_STYLE',
+                                     'modname')
+    if not naming_style:
         return
 
     # special cases, do nothing
     if modname in {'<stdin>', '<unknown>'}:
         return
 
-    naming_style = REGEXPS['modname'][naming_style_name]
     if not naming_style.match(modname):
         messages.add_to_file(Warnings.MODULE_NAMING_STYLE, modname=modname)
 
@@ -286,23 +397,51 @@ class _FindLValues(pytree_visitor.PyTreeVisitor):
             raise StopIteration()
 
 
-def warn_vars_naming_style(messages, line, style):
-    """ Check whether varibales and function argumens fit the naming rule."""
+def _iter_token_range(first, last):
+    while True:
+        yield first
+        if first is last:
+            break
+        first = first.next_token
+
+
+def _iter_parameters(paramlist):
+    for item in paramlist:
+        tokens = _iter_token_range(item.first_token, item.last_token)
+        tokens = filter(lambda t: t.name in {'NAME', 'STAR'}, tokens)
+        first = next(tokens, None)
+
+        if first is None:
+            # This is possible when a comment is added to a function
+            # argument (in some cases, when there is a trailing comma):
+            #
+            #     def fn(arg1,
+            #         arg2, #comment
+            #         arg3,
+            #         ):
+            #         pass
+            #
+            assert item.first_token.name == 'COMMENT'
+            continue
+        if first.name == 'STAR':
+            yield next(tokens, first)
+        yield first
+
 
-    naming_style_name = style.Get('CHECK_VAR_NAMING_STYLE')
-    if not naming_style_name:
-        return
+def _warn_invalid_var_names(messages, line, tokens, naming_style):
+    for tok in tokens:
+        # explicitly allow UPPER CASE names, because constants sould be
+        # named this way regargless the naming style
+        if not (tok.value == 'self'
+                or tok.value.isupper()
+                or naming_style.match(tok.value)):
+            messages.add(tok, line, Warnings.VAR_NAMING_STYLE, variable=tok.value)
 
-    def is_expr(uwl):
-        return (uwl.tokens
-                and _find_parent(uwl.first.node, None, [syms.expr_stmt]))
 
-    def is_assignment(uwl):
-        return (is_expr(uwl)
-                and next(filter(lambda t: t.is_name, uwl.tokens), None))
+def warn_vars_naming_style(messages, line, prev_line, naming_style):
+    """ Check whether assigned varibales fit the naming rule."""
 
-    def get_lhs_tokens(uwl):
-        root = _find_parent(uwl.first.node, None, [syms.expr_stmt])
+    def get_lhs_tokens(uwl, root):
         lvalues = _FindLValues(root).lvalues
 
         for tok in uwl.tokens:
@@ -315,163 +454,131 @@ def warn_vars_naming_style(messages, line, style):
                         or (len(chain) == 2 and chain[0] == 'self')):
                     yield tok
 
-    def iter_token_range(first, last):
-        while True:
-            yield first
-            if first is last:
-                break
-            first = first.next_token
-
-    def iter_parameters(paramlist):
-        for item in paramlist:
-            tokens = iter_token_range(item.first_token, item.last_token)
-            tokens = filter(lambda t: t.name in {'NAME', 'STAR'}, tokens)
-            first = next(tokens, None)
-
-            if first is None:
-                # This is possible when a comment is added to a function
-                # argument (in some cases, when there is a trailing comma):
-                #
-                #     def fn(arg1,
-                #         arg2, #comment
-                #         arg3,
-                #         ):
-                #         pass
-                #
-                assert item.first_token.name == 'COMMENT'
-                continue
-            if first.name == 'STAR':
-                yield next(tokens, first)
-            yield first
+    # an assignment is always inside of its simple statement, so there is
+    # no need to climb up further than the enclosing statement or block
+    root = _find_parent(line.first.node, None,
+                        [syms.expr_stmt, syms.simple_stmt, syms.suite,
+                         syms.file_input])
+    if root is None or root.type != syms.expr_stmt:
+        return
+
+    if next(filter(lambda t: t.is_name, line.tokens), None):
+        _warn_invalid_var_names(messages, line, get_lhs_tokens(line, root),
+                                naming_style)
+
+
+def warn_args_naming_style(messages, line, prev_line, naming_style):
+    """ Check whether function argumens fit the naming rule."""
 
     def get_func_args(uwl):
         for tok in uwl.tokens:
             if not tok.parameters:
                 continue
-            yield from iter_parameters(tok.parameters)
+            yield from _iter_parameters(tok.parameters)
 
-    if is_assignment(line):
-        tokens = get_lhs_tokens(line)
-    elif line.tokens and line.is_func_definition:
-        tokens = get_func_args(line)
-    else:
-        return
+    if line.is_func_definition:
+        _warn_invalid_var_names(messages, line, get_func_args(line),
+                                naming_style)
 
-    naming_style = REGEXPS['varname'][naming_style_name]
-    for tok in tokens:
-        # explicitly allow UPPER CASE names, because constants sould be
-        # named this way regargless the naming style
-        if not (tok.value == 'self'
-                or tok.value.isupper()
-                or naming_style.match(tok.value)):
-            messages.add(tok, line.AsCode(), Warnings.VAR_NAMING_STYLE, variable=tok.value)
+
+class ScopeIndex:
+    """ Track the class / function enclosing each line in a single pass.
+
+    The lines come in the source order, so the scopes which are still open
+    form a stack: a line closes all the scopes that are not less indented
+    than itself. This replaces walking up the pytree for every definition.
+    """
+
+    def __init__(self):
+        self.__stack = []
+        self.current = None
+
+    def update(self, line):
+        """ Move to the line, `current` becomes the root node of the scope
+        (`classdef` or `funcdef`) the line is in, or None at module level.
+        """
+
+        # comments may be less indented than the code around them
+        if line.is_comment:
+            return
+
+        while self.__stack and self.__stack[-1][0] >= line.depth:
+            self.__stack.pop()
+        self.current = self.__stack[-1][1] if self.__stack else None
+
+        node = self.__get_scope_node(line)
+        if node is not None:
+            self.__stack.append((line.depth, node))
+
+    def __get_scope_node(self, line):
+        first = line.first
+        if first.value == 'async' and len(line.tokens) > 1:
+            first = line.tokens[1]
+
+        node = first.node.parent
+        if node.type in {syms.classdef, syms.funcdef}:
+            return node
+        return None
 
 
 class RedefenitionChecker:
     """ Generate warnings when a class / function / method is redefined."""
 
-    def __init__(self):
+    def __init__(self, scopes):
         self.__names = collections.defaultdict(set)
         self.__first_defs = dict()
+        self.__scopes = scopes
 
-    def __call__(self, messages, line, style):
-        if not style.Get('WARN_REDEFINITION'):
-            return
-
-        if not (line.tokens
-                and (line.is_func_definition or line.is_class_definition)):
+    def __call__(self, messages, line, report=True):
+        if not (line.is_func_definition or line.is_class_definition):
             return
 
-        scope = id(self.__get_parent_scope(line))
+        scope = id(self.__scopes.current)
         name = self.__get_name(line)
 
-        if name.value in self.__names[scope]:
+        if name.value in self.__names[scope] and report:
             first = self.__first_defs[(scope, name.value)]
             messages.add_anchor(first)
-            messages.add(name, line.AsCode(), Warnings.REDEFININED, name=name.value,
+            messages.add(name, line, Warnings.REDEFININED, name=name.value,
                          first=partial(messages.get_lineno, first))
 
-        else:
+        elif name.value not in self.__names[scope]:
             self.__first_defs[(scope, name.value)] = name
 
         self.__names[scope].add(name.value)
 
-    def __get_parent_scope(self, line):
-        """ Returns the root node for the line's scope.
-
-        For instance, for `my_method()` in the example below it
-        would return a reference to the parent 'classdef' node.
-
-            classdef
-                NAME class
-                NAME MyClass
-                COLON
-                suite
-                    ...
-                    funcdef
-                        NAME def
-                        name my_method
-            ...
-        """
-
-        def if_class_or_func_def(node):
-            return node.type == syms.classdef or node.type == syms.funcdef
-
-        node = line.first.node.parent
-        assert if_class_or_func_def(node)
-
-        node = node.parent
-        while node.parent is not None:
-            if if_class_or_func_def(node):
-                return node
-            node = node.parent
-
-        return node
-
     def __get_name(self, line):
         return next(filter(lambda t: t.name == 'NAME', line.tokens[1:]))
 
 
-def warn_incorrect_comparison_with_none(messages, line, style):
+def warn_incorrect_comparison_with_none(messages, line, op):
     """ Warn when a comaprison to none uses `==` operator."""
 
-    if not style.Get('WARN_INCORRECT_COMPARISON_WITH_NONE'):
-        return
-
     def to_string(node):
         if isinstance(node, pytree.Leaf):
             return node.value
         else:
             return ''.join(l.value for l in node.leaves())
 
-    def find_comp_exprs(line):
-        for tok in line.tokens:
-            if tok.is_binary_op and tok.value in {'==', '!='}:
-                left = tok.node.prev_sibling
-                right = tok.node.next_sibling
-
-                # Ignore any compound operands (e.g. tuples)
-                # is this case both operands would be `pytree.Node`.
-                # `None` is always a `pytree.Leaf`, but the second operand
-                # may not be if, for excample, it is a function call.
-
-                if (isinstance(left, pytree.Leaf)
-                        or isinstance(right, pytree.Leaf)):
-                    yield left, tok, right
-
     def add_warn(op, operand):
         if op.value == '==':
-            messages.add(op, line.AsCode(), Warnings.COMP_WITH_NONE,
+            messages.add(op, line, Warnings.COMP_WITH_NONE,
                          var=to_string(operand), op='is')
         elif op.value == '!=':
-            messages.add(op, line.AsCode(), Warnings.COMP_WITH_NONE,
+            messages.add(op, line, Warnings.COMP_WITH_NONE,
                          var=to_string(operand), op='is not')
 
-    for left, op, right in find_comp_exprs(line):
-        if isinstance(left, pytree.Leaf) and left.value == 'None':
-            add_warn(op, right)
-        if isinstance(right, pytree.Leaf) and right.value == 'None':
-            add_warn(op, left)
+    if not op.is_binary_op:
+        return
+
+    # `None` is always a `pytree.Leaf`, compound operands (e.g. tuples or
+    # function calls) are `pytree.Node`s
+    left = op.node.prev_sibling
+    right = op.node.next_sibling
+    if isinstance(left, pytree.Leaf) and left.value == 'None':
+        add_warn(op, right)
+    if isinstance(right, pytree.Leaf) and right.value == 'None':
+        add_warn(op, left)
 
 
 class ScriptsCodeIncapsulationChecker:
@@ -483,28 +590,20 @@ class ScriptsCodeIncapsulationChecker:
     stmt = re.compile(
         r'if[\\\s(]+__name__[\s\\]*==[\s\\]*[\'"]__main__[\'"][\\\s)]*:')
 
-    def __init__(self):
-        self.can_be_executed = False
+    def __init__(self, uwlines):
+        first_line = uwlines[0] if uwlines else None
+        self.can_be_executed = bool(first_line
+                                    and first_line.tokens
+                                    and first_line.is_comment
+                                    and first_line.first.value.startswith('#!'))
         self.checks_for_main = False
 
-    def __call__(self, line, prev_line, style):
-        if not style.Get('CHECK_SCRIPT_CODE_ENCAPSULATION'):
-            return
-
-        if prev_line is None:
-            if (line.tokens
-                    and line.is_comment
-                    and line.first.value.startswith('#!')):
-                self.can_be_executed = True
-
-        elif not self.can_be_executed:
-            return
-
-        elif not self.checks_for_main:
+    def __call__(self, messages, line, report=True):
+        if not self.checks_for_main:
             self.checks_for_main = self.__check_for_main(line)
 
     def __check_for_main(self, line):
-        if line.tokens and line.first.is_keyword and line.first.value == 'if':
+        if line.first.is_keyword and line.first.value == 'if':
             return self.stmt.match(str(line)) is not None
 
         return False
@@ -514,23 +613,14 @@ class ScriptsCodeIncapsulationChecker:
             messages.add_to_file(Warnings.SCRIPT_CODE_ENCAPSULATION)
 
 
-def warn_bare_except_clauses(messages, line, style):
+def warn_bare_except_clauses(messages, line, prev_line):
     """ Check if code uses bare `except` clauses."""
 
-    if not style.Get('WARN_BARE_EXCEPT_CLAUSES'):
-        return
-
-    def is_exception_handler(line):
-        return (line.tokens
-                and line.first.is_keyword
-                and line.first.value == 'except'
-                )
-
     def lack_exception_type(line):
         return not any(tok.is_name for tok in line.tokens)
 
-    if is_exception_handler(line) and lack_exception_type(line):
-        messages.add(line.first, line.AsCode(), Warnings.BARE_EXCEPT)
+    if lack_exception_type(line):
+        messages.add(line.first, line, Warnings.BARE_EXCEPT)
 
 
 def _is_on_the_right_of(node, target):
@@ -557,16 +647,10 @@ def _is_on_the_right_of(node, target):
     return by_type()
 
 
-def warn_lost_exception(messages, line, style):
+def warn_lost_exception(messages, line, prev_line):
     """ Warn if a return / break statement is executed from within
     a finally block."""
 
-    if not style.Get('WARN_LOST_EXCEPTIONS'):
-        return
-
-    if not (line.tokens and line.first.value in {'return', 'break'}):
-        return
-
     # Currently we ignore return/break statements in any nested stuctures
     # for simplicity. The reason is that in some case these statements
     # might not lead outse the final block:
@@ -587,18 +671,15 @@ def warn_lost_exception(messages, line, style):
         return is_in_finally_block(node.parent)
 
     if is_in_finally_block(line.first.node):
-        messages.add(line.first, line.AsCode(), Warnings.LOST_EXCEPTION,
+        messages.add(line.first, line, Warnings.LOST_EXCEPTION,
                      stmt=line.first.value)
 
 
-def warn_misplaced_bare_raise(messages, line, style):
+def warn_misplaced_bare_raise(messages, line, prev_line):
     """ Check if all `raise` statements that do not specify an exception
     are called in `except` clauses."""
 
-    if not style.Get('WARN_MISPLACED_BARE_RAISE'):
-        return
-
-    if not (line.tokens and line.first.value == 'raise'):
+    if len(line.tokens) != 1:
         return
 
     def is_in_except_clause(node):
@@ -612,8 +693,8 @@ def warn_misplaced_bare_raise(messages, line, style):
 
         return is_in_except_clause(node.parent)
 
-    if not is_in_except_clause(line.first.node) and len(line.tokens) == 1:
-        messages.add(line.first, line.AsCode(), Warnings.MISPLACED_BARE_RAISE)
+    if not is_in_except_clause(line.first.node):
+        messages.add(line.first, line, Warnings.MISPLACED_BARE_RAISE)
 
 
 def warn_missing_copyright(messages, modname, uwlines, style):
@@ -624,6 +705,18 @@ def warn_missing_copyright(messages, modname, uwlines, style):
     if not pattern:
         return
 
+    if all(line.is_comment for line in uwlines):
+        # nothing but comments, like an empty or license-only __init__.py
+        return
+
+    if style.Get('AGGRESSIVELY_MOVE_COPYRIGHT_TO_HEAD'):
+        # the copyright may still be below the imports when the code is not
+        # reformatted (--lint-only), the fixer would move it to the head
+        doc_string = get_copyright_doc_string(uwlines)
+        if not (doc_string and re.search(pattern, doc_string.token.value)):
+            messages.add_to_file(Warnings.MISSING_COPYRIGHT, modname=modname)
+        return
+
     for line in uwlines:
         if line.is_comment:
             continue
@@ -29,10 +29,32 @@ These APIs have some common arguments:
     than a whole file.
   print_diff: (bool) Instead of returning the reformatted source, return a
     diff that turns the formatted source into reformatter source.
-  verify: (bool) True if reformatted code should be verified for syntax.
+  verify: (bool) True if reformatted code should be verified for syntax and
+    for equivalence to the original.
+  check_equivalence: (bool) True if the ASTs of the original and the
+    reformatted code should be compared, without the per-line syntax check of
+    verify. The comparison ignores what the configured fixers may change: the
+    whitespace in docstrings, the order of the top-level imports, and the
+    splitting of import lists.
+  warnings: (list) If not None, the style warnings are appended to it as dicts
+    (see warn_msg.Messages.render) instead of being printed to stderr, e.g. to
+    write one report for many files with warn_msg.write_report.
+  low_memory: (bool) True if the parse tree should be freed before the lines
+    are reformatted, keeping only compact copies of the leaves. This lowers the
+    memory use while large files are reformatted, at the cost of a pass over
+    the tree.
+  output: (callable) If not None, the reformatted code is passed to it in
+    chunks, each one as soon as it's formatted (see reformatter.Reformat),
+    instead of being returned. With verify or check_equivalence the code is
+    passed on in one piece once it's checked. It can't be combined with
+    print_diff.
+  check: (bool) True if it's only to be found out whether the code changes.
+    The reformatted code is compared with the original one as it's formatted,
+    and the formatting stops at the first difference, so the warnings are only
+    collected for code that doesn't change. verify and check_equivalence have
+    nothing to check then. It can't be combined with print_diff or output.
 """
 
-import difflib
 import re
 import sys
 
@@ -43,6 +65,7 @@ from yapf.yapflib import comment_splicer
 from yapf.yapflib import continuation_splicer
 from yapf.yapflib import file_resources
 from yapf.yapflib import identify_container
+from yapf.yapflib import line_ranges
 from yapf.yapflib import long_lines_splitter
 from yapf.yapflib import py3compat
 from yapf.yapflib import pytree_unwrapper
@@ -51,8 +74,12 @@ from yapf.yapflib import reformatter
 from yapf.yapflib import split_penalty
 from yapf.yapflib import style
 from yapf.yapflib import subtype_assigner
+from yapf.yapflib import unified_diff
+from yapf.yapflib import verifier
+from yapf.yapflib.warnings import warnings_utils
 from yapf.yapflib.fixers import comment_formatter
 from yapf.yapflib.fixers import import_list_splitter
+from yapf.yapflib.fixers import import_sorter
 from yapf.yapflib.fixers.fix_copyright_doc_string import move_doc_string_to_head
 from yapf.yapflib.fixers.fix_import_order import move_all_imports_to_head
 
@@ -63,47 +90,94 @@ def FormatFile(filename,
                print_diff=False,
                verify=False,
                in_place=False,
-               logger=None):
+               logger=None,
+               check_equivalence=False,
+               warnings=None,
+               low_memory=False,
+               output=None,
+               check=False):
   """Format a single Python file and return the formatted code.
 
   Arguments:
     filename: (unicode) The file to reformat.
     in_place: (bool) If True, write the reformatted code back to the file.
     logger: (io streamer) A stream to output logging.
+    output: (callable) If not None, the reformatted code is passed to it in
+      chunks with the line endings of the file, instead of being returned.
     remaining arguments: see comment at the top of this module.
 
   Returns:
     Tuple of (reformatted_code, encoding, changed). reformatted_code is None if
-    the file is successfully written to (having used in_place). reformatted_code
-    is a diff if print_diff is True.
+    the file is successfully written to (having used in_place), the code is
+    passed to output or check is True. reformatted_code is a diff if print_diff
+    is True.
 
   Raises:
     IOError: raised if there was an error reading the file.
-    ValueError: raised if in_place and print_diff are both specified.
+    ValueError: raised if more than one of in_place, print_diff, output and
+      check are specified.
   """
   _CheckPythonVersion()
 
   if in_place and print_diff:
     raise ValueError('Cannot pass both in_place and print_diff.')
+  if output is not None and (in_place or print_diff):
+    raise ValueError('Cannot pass output with in_place or print_diff.')
+  if check and (in_place or print_diff or output is not None):
+    raise ValueError('Cannot pass check with in_place, print_diff or output.')
 
   original_source, newline, encoding = ReadFile(filename, logger)
+  if check:
+    _, changed = FormatCode(
+        original_source,
+        style_config=style_config,
+        filename=filename,
+        lines=lines,
+        warnings=warnings,
+        low_memory=low_memory,
+        check=True)
+    return None, encoding, changed
+
+  if output is not None:
+    writer = _NewlineWriter(newline, output)
+    _, changed = FormatCode(
+        original_source,
+        style_config=style_config,
+        filename=filename,
+        lines=lines,
+        verify=verify,
+        check_equivalence=check_equivalence,
+        warnings=warnings,
+        low_memory=low_memory,
+        output=writer)
+    writer.Close()
+    return None, encoding, changed
+
   reformatted_source, changed = FormatCode(
       original_source,
       style_config=style_config,
       filename=filename,
       lines=lines,
       print_diff=print_diff,
-      verify=verify)
-  if reformatted_source.rstrip('\n'):
-    lines = reformatted_source.rstrip('\n').split('\n')
-    reformatted_source = newline.join(line for line in lines) + newline
+      verify=verify,
+      check_equivalence=check_equivalence,
+      warnings=warnings,
+      low_memory=low_memory)
   if in_place:
     if original_source and original_source != reformatted_source:
-      file_resources.WriteReformattedCode(filename, reformatted_source,
-                                          encoding, in_place)
+      file_resources.WriteReformattedCode(
+          filename, _WithLineEnding(reformatted_source, newline), encoding,
+          in_place)
     return None, encoding, changed
 
-  return reformatted_source, encoding, changed
+  return _WithLineEnding(reformatted_source, newline), encoding, changed
+
+
+def _WithLineEnding(code, newline):
+  """Return the code, which ends with a single newline, with the newline."""
+  if newline == '\n' or not code.rstrip('\n'):
+    return code
+  return code.replace('\n', newline)
 
 
 def FormatCode(unformatted_source,
@@ -111,7 +185,12 @@ def FormatCode(unformatted_source,
                style_config=None,
                lines=None,
                print_diff=False,
-               verify=False):
+               verify=False,
+               check_equivalence=False,
+               warnings=None,
+               low_memory=False,
+               output=None,
+               check=False):
   """Format a string of Python code.
 
   This provides an alternative entry point to YAPF.
@@ -123,9 +202,18 @@ def FormatCode(unformatted_source,
 
   Returns:
     Tuple of (reformatted_source, changed). reformatted_source conforms to the
-    desired formatting style. changed is True if the source changed.
+    desired formatting style, it's None if it was passed to output or check is
+    True. changed is True if the source changed.
+
+  Raises:
+    ValueError: raised if more than one of print_diff, output and check are
+      specified.
   """
   _CheckPythonVersion()
+  if print_diff and output is not None:
+    raise ValueError('Cannot pass both print_diff and output.')
+  if check and (print_diff or output is not None):
+    raise ValueError('Cannot pass check with print_diff or output.')
   style.SetGlobalStyle(style.CreateStyleFromConfig(style_config))
   if not unformatted_source.endswith('\n'):
     unformatted_source += '\n'
@@ -137,32 +225,61 @@ def FormatCode(unformatted_source,
     raise
 
   # disable lines outside the --lines range
-  lines = _LineRangesToSet(lines)
+  lines = line_ranges.CreateLineRanges(lines)
 
   # Run passes on the tree, modifying it in place.
   comment_splicer.SpliceComments(tree)
   continuation_splicer.SpliceContinuations(tree)
   subtype_assigner.AssignSubtypes(tree)
   identify_container.IdentifyContainers(tree)
-  split_penalty.ComputeSplitPenalties(tree)
+  split_penalty.ComputeSplitPenalties(
+      tree, None if _ReordersCode(style) else lines)
   blank_line_calculator.CalculateBlankLines(tree)
   long_lines_splitter.SplitLongLines(tree, lines)
 
   uwlines = pytree_unwrapper.UnwrapPyTree(tree)
+  # only the tokens refer to the tree from now on (see low_memory)
+  del tree
 
   # make all ordering of code (imports/comments/variables declarations/e.t.c.)
   _OrderCode(uwlines, style)
 
-  for uwl in uwlines:
-    uwl.CalculateFormattingInformation()
+  _CalculateFormattingInformation(uwlines, lines)
 
   _MarkLinesToFormat(uwlines, lines)
 
   uwlines = import_list_splitter.split_import_lists(uwlines)
+  uwlines = import_sorter.sort_imports(uwlines)
   uwlines = comment_formatter.format_comments(uwlines)
   uwlines = _SplitSemicolons(uwlines)
 
-  reformatted_source = reformatter.Reformat(uwlines, filename, verify, lines)
+  if check or (output is not None and not (verify or check_equivalence)):
+    comparing_output = _ComparingOutput(unformatted_source, output)
+    try:
+      reformatter.Reformat(
+          uwlines,
+          filename,
+          lines=lines,
+          warnings=warnings,
+          release_tree=low_memory,
+          output=comparing_output)
+    except _SourceChanged:
+      pass
+    return None, comparing_output.Changed()
+
+  reformatted_source = reformatter.Reformat(
+      uwlines, filename, verify, lines, warnings, release_tree=low_memory)
+  if verify or check_equivalence:
+    verifier.VerifyEquivalence(
+        unformatted_source,
+        reformatted_source,
+        split_imports=style.Get('SPLIT_SINGLE_LINE_IMPORTS'),
+        hoist_imports=_ReordersCode(style),
+        sort_imports=style.Get('SORT_IMPORTS'))
+
+  if output is not None:
+    output(reformatted_source)
+    return None, unformatted_source != reformatted_source
 
   if unformatted_source == reformatted_source:
     return '' if print_diff else reformatted_source, False
@@ -176,6 +293,69 @@ def FormatCode(unformatted_source,
   return reformatted_source, True
 
 
+def LintFile(filename, style_config=None, lines=None, logger=None):
+  """Check a single Python file for style warnings without reformatting it.
+
+  Arguments:
+    filename: (unicode) The file to check.
+    logger: (io streamer) A stream to output logging.
+    remaining arguments: see comment at the top of this module.
+
+  Returns:
+    A warn_msg.Messages with the warnings, located at the lines of the file.
+
+  Raises:
+    IOError: raised if there was an error reading the file.
+  """
+  _CheckPythonVersion()
+  original_source, _, _ = ReadFile(filename, logger)
+  return LintCode(
+      original_source,
+      filename=filename,
+      style_config=style_config,
+      lines=lines)
+
+
+def LintCode(unformatted_source,
+             filename='<unknown>',
+             style_config=None,
+             lines=None):
+  """Check a string of Python code for style warnings.
+
+  Only the passes that the warning checkers rely on are run: the code is not
+  reordered, split or reformatted, so this is much cheaper than FormatCode.
+
+  Arguments:
+    unformatted_source: (unicode) The code to check.
+    filename: (unicode) The name of the file being checked.
+    remaining arguments: see comment at the top of this module.
+
+  Returns:
+    A warn_msg.Messages with the warnings, located at the lines of the source.
+  """
+  _CheckPythonVersion()
+  style.SetGlobalStyle(style.CreateStyleFromConfig(style_config))
+  if not unformatted_source.endswith('\n'):
+    unformatted_source += '\n'
+
+  try:
+    tree = pytree_utils.ParseCodeToTree(unformatted_source)
+  except parse.ParseError as e:
+    e.msg = filename + ': ' + e.msg
+    raise
+
+  comment_splicer.SpliceComments(tree)
+  continuation_splicer.SpliceContinuations(tree)
+  subtype_assigner.AssignSubtypes(tree)
+
+  uwlines = pytree_unwrapper.UnwrapPyTree(tree)
+
+  messages = warnings_utils.check_all_recommendations(
+      uwlines, style, filename, line_ranges.CreateLineRanges(lines))
+  messages.set_source_locations()
+  return messages
+
+
 def _CheckPythonVersion():  # pragma: no cover
   errmsg = 'yapf is only supported for Python 2.7 or 3.4+'
   if sys.version_info[0] == 2:
@@ -209,10 +389,14 @@ def ReadFile(filename, logger=None):
     # Preserves line endings.
     with py3compat.open_with_encoding(
         filename, mode='r', encoding=encoding, newline='') as fd:
-      lines = fd.readlines()
-
-    line_ending = file_resources.LineEnding(lines)
-    source = '\n'.join(line.rstrip('\r\n') for line in lines) + '\n'
+      source = fd.read()
+
+    line_ending = file_resources.SourceLineEnding(source)
+    if file_resources.CR in source:
+      source = source.replace(file_resources.CRLF, file_resources.LF).replace(
+          file_resources.CR, file_resources.LF)
+    if not source.endswith(file_resources.LF):
+      source += file_resources.LF
     return source, line_ending, encoding
   except IOError as err:  # pragma: no cover
     if logger:
@@ -240,25 +424,37 @@ DISABLE_PATTERN = r'^#.*\byapf:\s*disable\b'
 ENABLE_PATTERN = r'^#.*\byapf:\s*enable\b'
 
 
-def _LineRangesToSet(line_ranges):
-  """Return a set of lines in the range."""
+def _LineInRanges(uwline, lines):
+  """Return True if the unwrapped line overlaps the lines to format."""
+  return lines.Overlaps(uwline.lineno, uwline.last.lineno)
+
 
-  if line_ranges is None:
-    return None
+def _CalculateFormattingInformation(uwlines, lines):
+  """Calculate the formatting information of the lines.
 
-  line_set = set()
-  for low, high in sorted(line_ranges):
-    line_set.update(range(low, high + 1))
+  Lines outside of the --lines range are emitted unformatted, so only the lines
+  inside the range and their immediate neighbours (which the line joiner and
+  the vertical spacing logic look at) need the split penalties and the break
+  decisions.
+  """
+  if not lines:
+    for uwline in uwlines:
+      uwline.CalculateFormattingInformation()
+    return
 
-  return line_set
+  in_range = [_LineInRanges(uwline, lines) for uwline in uwlines]
+  for index, uwline in enumerate(uwlines):
+    if any(in_range[max(index - 1, 0):index + 2]):
+      uwline.CalculateFormattingInformation()
+    else:
+      uwline.CalculateUnformattedInformation()
 
 
 def _MarkLinesToFormat(uwlines, lines):
   """Skip sections of code that we shouldn't reformat."""
   if lines:
     for uwline in uwlines:
-      uwline.disable = not lines.intersection(
-          range(uwline.lineno, uwline.last.lineno + 1))
+      uwline.disable = not _LineInRanges(uwline, lines)
 
   # Now go through the lines and disable any lines explicitly marked as
   # disabled.
@@ -307,14 +503,86 @@ def _GetUnifiedDiff(before, after, filename='code'):
   before = before.splitlines()
   after = after.splitlines()
   return '\n'.join(
-      difflib.unified_diff(
+      unified_diff.UnifiedDiff(
           before,
           after,
           filename,
           filename,
           '(original)',
-          '(reformatted)',
-          lineterm='')) + '\n'
+          '(reformatted)')) + '\n'
+
+
+class _SourceChanged(Exception):
+  """Stops the reformatting at the first difference to the original source."""
+
+
+class _ComparingOutput(object):
+  """Passes the reformatted code on, comparing it with the original source.
+
+  Without an output, _SourceChanged is raised at the first chunk that differs.
+  """
+
+  def __init__(self, source, output=None):
+    self._source = source
+    self._output = output
+    self._position = 0
+    self._changed = False
+
+  def __call__(self, chunk):
+    if not self._changed:
+      self._changed = not self._source.startswith(chunk, self._position)
+    self._position += len(chunk)
+    if self._output is not None:
+      self._output(chunk)
+    elif self._changed:
+      raise _SourceChanged()
+
+  def Changed(self):
+    return self._changed or self._position != len(self._source)
+
+
+class _NewlineWriter(object):
+  """Passes chunks of code on with the given line endings.
+
+  The code ends with a single newline, as the whole code does in FormatFile:
+  the trailing newlines of a chunk are held back until some code follows them.
+  """
+
+  def __init__(self, newline, output):
+    self._newline = newline
+    self._output = output
+    self._newlines = ''  # The newlines which are held back.
+    self._has_code = False
+
+  def __call__(self, chunk):
+    code = chunk.rstrip('\n')
+    if not code:
+      self._newlines += chunk
+      return
+    text = self._newlines + code
+    self._newlines = chunk[len(code):]
+    self._has_code = True
+    if self._newline != '\n':
+      text = text.replace('\n', self._newline)
+    self._output(text)
+
+  def Close(self):
+    """Write the end of the code."""
+    if self._has_code:
+      self._output(self._newline)
+    elif self._newlines:
+      self._output(self._newlines)
+
+
+def _ReordersCode(style):
+  """Return True if the fixers may move lines away from their original place.
+
+  The --lines range refers to the original source, so passes over the tree may
+  only skip statements outside of it when nothing is going to be moved.
+  """
+  return (style.Get('AGGRESSIVELY_MOVE_ALL_IMPORTS_TO_HEAD') or
+          style.Get('AGGRESSIVELY_MOVE_COPYRIGHT_TO_HEAD'))
+
 
 def _OrderCode(uwlines, style):
     move_doc_string_to_head(uwlines, style)
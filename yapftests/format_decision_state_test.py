@@ -132,6 +132,45 @@ class FormatDecisionStateTest(yapf_test_helper.YAPFTest):
     clone = state.Clone()
     self.assertEqual(repr(state), repr(clone))
 
+  def testBracketMetrics(self):
+    code = textwrap.dedent(r"""
+      f(a, (b, c), {'d': e})
+      """)
+    uwlines = yapf_test_helper.ParseAndUnwrap(code)
+    uwline = unwrapped_line.UnwrappedLine(0, _FilterLine(uwlines[0]))
+    uwline.CalculateFormattingInformation()
+    tokens = uwline.tokens
+
+    state = format_decision_state.FormatDecisionState(uwline, 0)
+    clone = state.Clone()
+    self.assertIs(state.bracket_metrics, clone.bracket_metrics)
+
+    metrics = clone._GetBracketMetrics(tokens[1])
+    self.assertEqual(2, metrics.num_commas)
+    self.assertIs(tokens[10], metrics.first_dict)
+    self.assertIs(metrics, state._GetBracketMetrics(tokens[1]))
+
+    metrics = state._GetBracketMetrics(tokens[10])
+    self.assertEqual(0, metrics.num_commas)
+    self.assertIsNone(metrics.first_dict)
+    self.assertEqual((None, 6), metrics.dict_entry_lengths)
+
+  def testOpeningBrackets(self):
+    code = textwrap.dedent(r"""
+      f(a, [b, (c)], {'d': e}, g)
+      """)
+    uwlines = yapf_test_helper.ParseAndUnwrap(code)
+    uwline = unwrapped_line.UnwrappedLine(0, _FilterLine(uwlines[0]))
+    uwline.CalculateFormattingInformation()
+
+    opening_brackets = format_decision_state._FindOpeningBrackets(
+        uwline.tokens)
+    self.assertEqual(len(uwline.tokens), len(opening_brackets))
+    for tok in uwline.tokens:
+      self.assertIs(
+          format_decision_state._FindOpeningBracket(tok),
+          opening_brackets[id(tok)])
+
 
 def _FilterLine(uwline):
   """Filter out nonsemantic tokens from the UnwrappedLines."""
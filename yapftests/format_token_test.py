@@ -19,6 +19,7 @@ from lib2to3 import pytree
 from lib2to3.pgen2 import token
 
 from yapf.yapflib import format_token
+from yapf.yapflib import pytree_utils
 
 
 class TabbedContinuationAlignPaddingTest(unittest.TestCase):
@@ -90,6 +91,40 @@ class FormatTokenTest(unittest.TestCase):
     tok = format_token.FormatToken(pytree.Leaf(token.STRING, "'import'"))
     self.assertFalse(tok.is_import_keyword)
 
+  def testSynthesize(self):
+    leaf = pytree.Leaf(token.NAME, 'import', context=('', (3, 0)))
+    pytree_utils.SetNodeAnnotation(leaf, pytree_utils.Annotation.MUST_SPLIT,
+                                   True)
+    tok = format_token.FormatToken(leaf)
+    tok.split_penalty = 42
+
+    new_tok = tok.Synthesize()
+    self.assertIsNot(tok.node, new_tok.node)
+    self.assertEqual('import', new_tok.value)
+    self.assertEqual(42, new_tok.split_penalty)
+    self.assertTrue(new_tok.must_split)
+
+    new_tok.node.lineno = 5
+    self.assertEqual(3, tok.lineno)
+    self.assertEqual(5, new_tok.lineno)
+
+  def testSubtypes(self):
+    leaf = pytree.Leaf(token.PLUS, '+')
+    pytree_utils.AppendNodeAnnotation(leaf, pytree_utils.Annotation.SUBTYPE,
+                                      format_token.Subtype.BINARY_OPERATOR)
+    pytree_utils.AppendNodeAnnotation(leaf, pytree_utils.Annotation.SUBTYPE,
+                                      format_token.Subtype.A_EXPR_OPERATOR)
+    tok = format_token.FormatToken(leaf)
+    self.assertTrue(tok.is_binary_op)
+    self.assertTrue(tok.is_arithmetic_op)
+    self.assertFalse(tok.is_m_expr_op)
+    self.assertFalse(tok.is_simple_expr)
+
+    tok = format_token.FormatToken(pytree.Leaf(token.NAME, 'a'))
+    self.assertEqual([format_token.Subtype.NONE], tok.subtypes)
+    self.assertFalse(tok.is_binary_op)
+    self.assertFalse(hasattr(tok, '__dict__'))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -70,3 +70,34 @@ class RunMainTest(yapf_test_helper.YAPFTest):
                         import c
                         """)
         self.__check_test('False', formatted_code)
+
+    def test_interleaved_imports(self):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                "{based_on_style: pep8 aggressively_move_all_imports_to_head: "
+                "True}"))
+        unformatted_code = textwrap.dedent("""\
+                        '''docs'''
+                        import a
+
+                        x = 1
+                        import b
+                        y = 2
+                        import c
+                        z = 3
+                        import d
+                        """)
+        formatted_code = textwrap.dedent("""\
+                        '''docs'''
+                        import a
+
+                        import b
+                        import c
+                        import d
+
+                        x = 1
+                        y = 2
+                        z = 3
+                        """)
+        self.assertCodeEqual(formatted_code,
+                             FormatCode(unformatted_code)[0])
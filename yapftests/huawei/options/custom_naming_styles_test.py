@@ -0,0 +1,77 @@
+# -*- coding: utf-8
+"""
+Function: test CUSTOM_NAMING_STYLES configuration paramenter
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+"""
+
+import textwrap
+
+from yapf.yapflib import style
+from yapf.yapflib.style import StyleConfigError
+from yapf.yapflib.yapf_api import FormatCode
+from yapf.yapflib.warnings.naming_styles import NAMING_STYLES
+import yapf.yapflib.warnings.warnings_utils as warns
+
+from yapftests.huawei.options import testbase
+
+
+class RunMainTest(testbase.WarnTestBase):
+
+    def __setup(self, custom_styles, name):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                f'{{based_on_style: pep8, '
+                f'custom_naming_styles: "{custom_styles}", '
+                f'check_class_naming_style: {name}}}'))
+
+    def test_custom_style(self):
+        self.__setup('upper_snake_case=[A-Z][A-Z0-9_]*$', 'upper_snake_case')
+        self.assertEqual(style.Get('CUSTOM_NAMING_STYLES'),
+                         {'UPPERSNAKECASE': '[A-Z][A-Z0-9_]*$'})
+        self.assertEqual(style.Get('CHECK_CLASS_NAMING_STYLE'),
+                         'UPPERSNAKECASE')
+
+        input_source = textwrap.dedent("""\
+            class GOOD_NAME:
+                pass
+            class BadName:
+                pass
+        """)
+        FormatCode(input_source)
+
+        self.assertWarnMessage(warns.Warnings.CLASS_NAMING_STYLE, 'BadName')
+        self.assertWarnCount(warns.Warnings.CLASS_NAMING_STYLE, 1)
+
+    def test_override_builtin_style(self):
+        self.__setup('PascalCase=Base[A-Za-z]+$', 'PascalCase')
+
+        input_source = textwrap.dedent("""\
+            class BaseName:
+                pass
+            class OtherName:
+                pass
+        """)
+        FormatCode(input_source)
+
+        self.assertWarnMessage(warns.Warnings.CLASS_NAMING_STYLE, 'OtherName')
+        self.assertWarnCount(warns.Warnings.CLASS_NAMING_STYLE, 1)
+
+    def test_unknown_name(self):
+        with self.assertRaises(StyleConfigError):
+            self.__setup('upper_snake_case=[A-Z][A-Z0-9_]*$', 'other_name')
+
+    def test_invalid_regexp(self):
+        with self.assertRaises(StyleConfigError):
+            self.__setup('upper_snake_case=[A-Z', 'upper_snake_case')
+
+    def test_compiled_once(self):
+        custom_styles = {'UPPERSNAKECASE': '[A-Z][A-Z0-9_]*$'}
+        naming_style = NAMING_STYLES.get('classname', 'UPPERSNAKECASE',
+                                         custom_styles)
+
+        self.assertIs(
+            naming_style,
+            NAMING_STYLES.get('varname', 'UPPERSNAKECASE', custom_styles))
+        self.assertTrue(naming_style.match('GOOD_NAME'))
+        self.assertFalse(naming_style.match('BadName'))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8
+"""
+Function: test SORT_IMPORTS and FIRST_PARTY_MODULES configuration paramenters
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+"""
+
+import textwrap
+
+from yapf.yapflib import style
+from yapf.yapflib.fixers import import_sorter
+from yapf.yapflib.yapf_api import FormatCode
+from yapftests import yapf_test_helper
+
+
+class RunMainTest(yapf_test_helper.YAPFTest):
+
+    def __setup(self, enable, extra=''):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                f'{{based_on_style: pep8, sort_imports: {enable}, '
+                f'first_party_modules: "mypkg, other_pkg"{extra}}}'))
+
+    def test_options(self):
+        self.__setup(True)
+        self.assertTrue(style.Get('SORT_IMPORTS'))
+        self.assertEqual(style.Get('FIRST_PARTY_MODULES'),
+                         ['mypkg', 'other_pkg'])
+
+    def test_groups(self):
+        self.__setup(True)
+        unformatted_code = textwrap.dedent("""\
+            '''docs'''
+            from . import sibling
+            import numpy
+            from collections import OrderedDict
+            import mypkg.utils
+            import os  # trailing comment
+            from __future__ import annotations
+
+            import abc
+            x = 1
+            """)
+        formatted_code = textwrap.dedent("""\
+            '''docs'''
+            from __future__ import annotations
+
+            import abc
+            import os  # trailing comment
+            from collections import OrderedDict
+
+            import numpy
+
+            import mypkg.utils
+
+            from . import sibling
+            x = 1
+            """)
+        self.assertCodeEqual(
+            formatted_code,
+            FormatCode(unformatted_code, check_equivalence=True)[0])
+
+    def test_comments_end_blocks(self):
+        self.__setup(True)
+        unformatted_code = textwrap.dedent("""\
+            import sys
+            import abc
+            # comment to os
+            import os
+            import json
+
+
+            def f():
+                import sys
+                import abc
+            """)
+        formatted_code = textwrap.dedent("""\
+            import abc
+            import sys
+            # comment to os
+            import json
+            import os
+
+
+            def f():
+                import sys
+                import abc
+            """)
+        self.assertCodeEqual(formatted_code, FormatCode(unformatted_code)[0])
+
+    def test_split_imports(self):
+        self.__setup(True, ', split_single_line_imports: true')
+        unformatted_code = textwrap.dedent("""\
+            import sys, numpy, abc
+            """)
+        formatted_code = textwrap.dedent("""\
+            import abc
+            import sys
+
+            import numpy
+            """)
+        self.assertCodeEqual(
+            formatted_code,
+            FormatCode(unformatted_code, check_equivalence=True)[0])
+
+    def test_disabled_lines(self):
+        self.__setup(True)
+        unformatted_code = textwrap.dedent("""\
+            import sys
+            import abc
+            import os  # yapf: disable
+            import json
+            """)
+        formatted_code = textwrap.dedent("""\
+            import abc
+            import sys
+            import os  # yapf: disable
+            import json
+            """)
+        self.assertCodeEqual(formatted_code, FormatCode(unformatted_code)[0])
+
+    def test_negative_case(self):
+        self.__setup(False)
+        unformatted_code = textwrap.dedent("""\
+            import sys
+            import abc
+            """)
+        self.assertCodeEqual(unformatted_code, FormatCode(unformatted_code)[0])
+
+    def test_classify_module(self):
+        first_party = ('mypkg', 'json')
+        self.assertEqual(import_sorter.classify_module('__future__'),
+                         import_sorter.FUTURE)
+        self.assertEqual(import_sorter.classify_module('os.path'),
+                         import_sorter.STDLIB)
+        self.assertEqual(import_sorter.classify_module('numpy'),
+                         import_sorter.THIRD_PARTY)
+        self.assertEqual(
+            import_sorter.classify_module('mypkg.utils', first_party),
+            import_sorter.FIRST_PARTY)
+        self.assertEqual(import_sorter.classify_module('json', first_party),
+                         import_sorter.FIRST_PARTY)
+        self.assertEqual(
+            import_sorter.classify_module('mypkg_ext', first_party),
+            import_sorter.THIRD_PARTY)
+        self.assertEqual(import_sorter.classify_module('..sibling'),
+                         import_sorter.LOCAL)
@@ -8,15 +8,16 @@ Change History: 2019-12-02 Created
 import textwrap
 
 from yapf.yapflib import style, reformatter
+from yapf.yapflib.yapf_api import FormatCode
 from yapftests import yapf_test_helper
 
 
 class RunMainTest(yapf_test_helper.YAPFTest):
-    def __setup_import_splitter(self, enable):
+    def __setup_import_splitter(self, enable, extra=''):
         style.SetGlobalStyle(
             style.CreateStyleFromConfig(
                 f'{{based_on_style: huawei, '
-                f'split_single_line_imports: {enable}}}'))
+                f'split_single_line_imports: {enable}{extra}}}'))
 
     def test_positive_case(self):
         self.__setup_import_splitter(True)
@@ -25,3 +26,20 @@ class RunMainTest(yapf_test_helper.YAPFTest):
     def test_negative_case(self):
         self.__setup_import_splitter(False)
         self.assertFalse(style.Get('SPLIT_SINGLE_LINE_IMPORTS'))
+
+    def test_split_continued_line(self):
+        self.__setup_import_splitter(True, ', save_initial_blanklines: True')
+        unformatted_code = textwrap.dedent("""\
+            import os
+
+            import a, b as c, \\
+                d  # comment
+            """)
+        formatted_code = textwrap.dedent("""\
+            import os
+
+            import a
+            import b as c
+            import d  # comment
+            """)
+        self.assertCodeEqual(formatted_code, FormatCode(unformatted_code)[0])
@@ -22,10 +22,12 @@ class WarnTestBase(yapf_test_helper.YAPFTest):
                 return ''.join(self.messages)
 
             def write(self, redirect_str):
-                try:
-                    self.messages.append(json.loads(redirect_str))
-                except json.JSONDecodeError:
-                   pass
+                # the warnings of a file are written at once, a JSON per line
+                for line in redirect_str.splitlines():
+                    try:
+                        self.messages.append(json.loads(line))
+                    except json.JSONDecodeError:
+                       pass
 
 
         self.__orig_stderr = sys.stderr
@@ -53,3 +53,13 @@ class RunMainTest(testbase.WarnTestBase):
         FormatCode(input_source)
 
         self.assertWarnCount(warns.Warnings.MISSING_COPYRIGHT, 0)
+
+    def test_empty_file(self):
+        FormatCode('', style_config='huawei')
+
+        self.assertWarnCount(warns.Warnings.MISSING_COPYRIGHT, 0)
+
+    def test_comment_only_file(self):
+        FormatCode('# just a comment\n', style_config='huawei')
+
+        self.assertWarnCount(warns.Warnings.MISSING_COPYRIGHT, 0)
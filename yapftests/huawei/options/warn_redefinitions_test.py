@@ -5,7 +5,11 @@ Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010
 Change History: 2019-12-18 Created
 """
 
+import textwrap
+
 from yapf.yapflib import style
+from yapf.yapflib.yapf_api import FormatCode
+import yapf.yapflib.warnings.warnings_utils as warns
 
 from yapftests.huawei.options import testbase
 
@@ -24,3 +28,32 @@ class RunMainTest(testbase.WarnTestBase):
     def test_disabled(self):
         self.__setup(False)
         self.assertFalse(style.Get('WARN_REDEFINITION'))
+
+    def test_scopes(self):
+        self.__setup(True)
+
+        input_source = textwrap.dedent("""\
+            def f():
+                def g():
+                    pass
+                class A:
+                    def g(self):
+                        pass
+            # comment at the module level
+                    def g(self):
+                        pass
+                if True:
+                    def g():
+                        pass
+            def g():
+                pass
+        """)
+        FormatCode(input_source)
+
+        # method `A.g` and function `f.g` are redefined, the locations
+        # refer to the reformatted code
+        self.assertWarnMessage(warns.Warnings.REDEFININED,
+                               "'g' .*lineno=6", lineno=12)
+        self.assertWarnMessage(warns.Warnings.REDEFININED,
+                               "'g' .*lineno=2", lineno=17)
+        self.assertWarnCount(warns.Warnings.REDEFININED, 2)
@@ -5,10 +5,13 @@ Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010
 Change History: 2019-12-02 Created
 """
 
+import io
+import json
 import textwrap
 
 from yapf.yapflib import style
-from yapf.yapflib.yapf_api import FormatCode
+from yapf.yapflib.yapf_api import FormatCode, LintCode
+from yapf.yapflib.warnings import warn_msg
 import yapf.yapflib.warnings.warnings_utils as warns
 
 from yapftests.huawei.options import testbase
@@ -71,3 +74,143 @@ class RunMainTest(testbase.WarnTestBase):
 
         # should not raise any exception
         FormatCode(input_text, lines=[(10,10)])[0]
+
+    def test_warnings_limited_to_lines(self):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                f'{{based_on_style: pep8, '
+                f'check_var_naming_style: snake_case}}'))
+
+        input_source = textwrap.dedent("""\
+            FirstVar = 0
+            SecondVar = 1
+            ThirdVar = 2
+        """)
+        FormatCode(input_source, lines=[(2, 2)])
+
+        self.assertWarnCount(warns.Warnings.VAR_NAMING_STYLE, 1)
+        self.assertWarnMessage(warns.Warnings.VAR_NAMING_STYLE,
+            pattern='.*SecondVar', lineno=2)
+
+    def test_warnline_before_reformatting(self):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                f'{{based_on_style: pep8, '
+                f'warn_incorrect_comparison_with_none: true, '
+                f'warn_not_commented_global_vars: true, '
+                f'spaces_before_comment: "15, 20"}}'))
+
+        input_source = textwrap.dedent("""\
+            if x == None: pass
+            CONST = 1  # comment
+        """)
+        FormatCode(input_source)
+
+        # the one-liner is joined and the comment is aligned only after
+        # the lines were checked
+        warnlines = {msg['WARN']: msg['warnline']
+                     for msg in self._stderr.messages}
+        self.assertEqual(warnlines, {
+            warns.Warnings.COMP_WITH_NONE.value: 'if x == None :',
+            warns.Warnings.GLOBAL_VAR_COMMENT.value: 'CONST = 1 # comment',
+        })
+
+    def test_checker_engine_dispatch(self):
+        style.SetGlobalStyle(
+            style.CreateStyleFromConfig(
+                f'{{based_on_style: pep8, '
+                f'warn_bare_except_clauses: true, '
+                f'warn_incorrect_comparison_with_none: true}}'))
+
+        engine = warns.CheckerEngine(style, [])
+        self.assertEqual(set(engine.line_checkers), {'except'})
+        self.assertEqual(set(engine.token_checkers), {'==', '!='})
+        self.assertFalse(engine.every_line_checkers)
+        self.assertFalse(engine.stateful_checkers)
+
+    def test_lint_only(self):
+        input_source = textwrap.dedent("""\
+            if left > right or right > left: pass
+            SomeVariable = 0
+
+            def fn():
+                pass
+            OtherVar = fn()
+        """)
+        messages = LintCode(input_source, style_config=(
+            '{based_on_style: pep8, check_var_naming_style: snake_case, '
+            'column_limit: 30}'))
+        self.assertEqual(len(messages), 2)
+
+        # the warnings refer to the lines of the original code
+        messages.show()
+        self.assertWarnMessage(warns.Warnings.VAR_NAMING_STYLE,
+            pattern='.*SomeVariable', lineno=2)
+        self.assertWarnMessage(warns.Warnings.VAR_NAMING_STYLE,
+            pattern='.*OtherVar', lineno=6)
+
+
+class ReportFormatsTest(testbase.WarnTestBase):
+    def setUp(self):
+        super().setUp()
+        self.messages = LintCode(
+            'SomeVariable = 0\n', filename='module.py',
+            style_config='{based_on_style: pep8, '
+                         'check_var_naming_style: snake_case}')
+
+    def test_jsonl(self):
+        stream = io.StringIO()
+        self.messages.show(stream=stream)
+
+        warn_dicts = [json.loads(l) for l in stream.getvalue().splitlines()]
+        self.assertEqual(warn_dicts, self.messages.render())
+        self.assertEqual(warn_dicts[0]['warnline'], 'SomeVariable = 0')
+
+    def test_json(self):
+        stream = io.StringIO()
+        warn_msg.write_report([self.messages], 'json', stream)
+
+        warn_dicts = json.loads(stream.getvalue())
+        self.assertEqual(len(warn_dicts), 1)
+        self.assertEqual(warn_dicts[0]['lineno'], 1)
+
+    def test_merged_report(self):
+        other = LintCode('if x == None: pass\n', filename='another.py',
+                         style_config='{based_on_style: pep8, '
+                                      'warn_incorrect_comparison_with_none: true}')
+
+        # the rendered messages of the workers are merged, deduplicated
+        # and sorted by file
+        stream = io.StringIO()
+        warn_msg.write_report(
+            [self.messages.render(), other, self.messages.render()],
+            'jsonl', stream)
+
+        warn_dicts = [json.loads(l) for l in stream.getvalue().splitlines()]
+        self.assertEqual([w['WARN'] for w in warn_dicts],
+                         [warns.Warnings.COMP_WITH_NONE.value,
+                          warns.Warnings.VAR_NAMING_STYLE.value])
+
+    def test_summary(self):
+        stream = io.StringIO()
+        warn_msg.write_report([self.messages], 'summary', stream)
+
+        self.assertEqual(json.loads(stream.getvalue()),
+                         {'VAR_NAMING_STYLE': 1})
+
+    def test_sarif(self):
+        stream = io.StringIO()
+        self.messages.show(output_format='sarif', stream=stream)
+
+        run = json.loads(stream.getvalue())['runs'][0]
+        self.assertEqual(run['tool']['driver']['rules'],
+                         [{'id': 'VAR_NAMING_STYLE'}])
+        result = run['results'][0]
+        self.assertEqual(result['ruleId'], 'VAR_NAMING_STYLE')
+        self.assertEqual(
+            result['locations'][0]['physicalLocation']['region'],
+            {'startLine': 1})
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.messages.show(output_format='xml')
@@ -77,6 +77,17 @@ class LineJoinerTest(yapf_test_helper.YAPFTest):
         """)
     self._CheckLineJoining(code, join_lines=False)
 
+  def testStartingIndex(self):
+    code = textwrap.dedent(u"""\
+        x = 42
+        if isinstance(a, int): continue
+        y = 37
+        """)
+    uwlines = yapf_test_helper.ParseAndUnwrap(code)
+    self.assertFalse(line_joiner.CanMergeMultipleLines(uwlines))
+    self.assertTrue(line_joiner.CanMergeMultipleLines(uwlines, index=1))
+    self.assertFalse(line_joiner.CanMergeMultipleLines(uwlines, index=3))
+
 
 if __name__ == '__main__':
   unittest.main()
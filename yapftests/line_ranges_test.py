@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Function: Tests for yapf.line_ranges
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+"""
+
+import unittest
+
+from yapf.yapflib import line_ranges
+
+
+class LineRangesTest(unittest.TestCase):
+
+  def testMergesRanges(self):
+    ranges = line_ranges.LineRanges([(10, 12), (1, 3), (4, 5), (11, 20)])
+    self.assertEqual([(1, 5), (10, 20)], list(ranges))
+
+  def testEmpty(self):
+    self.assertFalse(line_ranges.LineRanges([]))
+    self.assertIsNone(line_ranges.CreateLineRanges(None))
+    self.assertNotIn(1, line_ranges.LineRanges([]))
+
+  def testContains(self):
+    ranges = line_ranges.LineRanges([(3, 5), (8, 8)])
+    self.assertEqual([3, 4, 5, 8], [n for n in range(1, 12) if n in ranges])
+
+  def testOverlaps(self):
+    ranges = line_ranges.LineRanges([(3, 5), (8, 8)])
+    self.assertTrue(ranges.Overlaps(1, 3))
+    self.assertTrue(ranges.Overlaps(5, 7))
+    self.assertTrue(ranges.Overlaps(6, 9))
+    self.assertTrue(ranges.Overlaps(1, 100))
+    self.assertFalse(ranges.Overlaps(6, 7))
+    self.assertFalse(ranges.Overlaps(9, 100))
+    self.assertFalse(ranges.Overlaps(1, 2))
+
+  def testCountOverlap(self):
+    ranges = line_ranges.LineRanges([(3, 5), (8, 8)])
+    self.assertEqual(4, ranges.CountOverlap(1, 10))
+    self.assertEqual(2, ranges.CountOverlap(4, 7))
+    self.assertEqual(0, ranges.CountOverlap(6, 7))
+    self.assertEqual(0, ranges.CountOverlap(5, 4))
+
+
+if __name__ == '__main__':
+  unittest.main()
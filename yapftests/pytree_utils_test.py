@@ -201,5 +201,43 @@ class AnnotationsTest(unittest.TestCase):
     self.assertEqual(pytree_utils.GetNodeAnnotation(self._node, _FOO), 20)
 
 
+class ReleaseTreeTest(unittest.TestCase):
+
+  def testReleaseTree(self):
+    tree = pytree_utils.ParseCodeToTree('foo(a, b)\n')
+    leaves = list(tree.leaves())
+    pytree_utils.ReleaseTree(tree)
+
+    self.assertTrue(all(leaf.parent is None for leaf in leaves))
+    self.assertEqual('foo(a, b)\n', str(tree))
+
+  def testDetachedLeaf(self):
+    leaf = pytree.Leaf(token.NAME, 'foo', context=('', (3, 4)))
+    pytree.Node(_GRAMMAR_SYMBOL2NUMBER['simple_stmt'], [leaf])
+    pytree_utils.SetNodeAnnotation(leaf, pytree_utils.Annotation.MUST_SPLIT,
+                                   True)
+    pytree_utils.SetOpeningBracket(leaf, leaf)
+
+    detached = pytree_utils.DetachedLeaf(leaf)
+    self.assertEqual((token.NAME, 'foo', 3, 4),
+                     (detached.type, detached.value, detached.lineno,
+                      detached.column))
+    self.assertIsNone(detached.parent)
+    self.assertTrue(
+        pytree_utils.GetNodeAnnotation(detached,
+                                       pytree_utils.Annotation.MUST_SPLIT))
+    self.assertIsNone(
+        pytree_utils.GetNodeAnnotation(detached,
+                                       pytree_utils.Annotation.NEWLINES))
+    self.assertIsNone(pytree_utils.GetOpeningBracket(detached))
+
+    pytree_utils.SetNodeAnnotation(detached, pytree_utils.Annotation.NEWLINES,
+                                   2)
+    self.assertEqual(
+        2,
+        pytree_utils.GetNodeAnnotation(detached,
+                                       pytree_utils.Annotation.NEWLINES))
+
+
 if __name__ == '__main__':
   unittest.main()
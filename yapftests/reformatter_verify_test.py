@@ -64,10 +64,6 @@ class TestVerifyNoVerify(yapf_test_helper.YAPFTest):
         if __name__ == "__main__":
           call_my_function(print)
         """)
-    uwlines = yapf_test_helper.ParseAndUnwrap(unformatted_code)
-    with self.assertRaises(verifier.InternalError):
-      reformatter.Reformat(uwlines, verify=True)
-
     expected_formatted_code = textwrap.dedent("""\
         from __future__ import print_function
 
@@ -79,6 +75,11 @@ class TestVerifyNoVerify(yapf_test_helper.YAPFTest):
         if __name__ == "__main__":
             call_my_function(print)
         """)
+    # The module is verified as a whole, so the future import is honored.
+    uwlines = yapf_test_helper.ParseAndUnwrap(unformatted_code)
+    self.assertCodeEqual(expected_formatted_code,
+                         reformatter.Reformat(uwlines, verify=True))
+
     uwlines = yapf_test_helper.ParseAndUnwrap(unformatted_code)
     self.assertCodeEqual(expected_formatted_code,
                          reformatter.Reformat(uwlines, verify=False))
@@ -104,5 +105,98 @@ class TestVerifyNoVerify(yapf_test_helper.YAPFTest):
                          reformatter.Reformat(uwlines, verify=False))
 
 
+class TestVerifyModule(yapf_test_helper.YAPFTest):
+
+  @classmethod
+  def setUpClass(cls):
+    style.SetGlobalStyle(style.CreatePEP8Style())
+
+  def testVerifyWholeModule(self):
+    unformatted_code = textwrap.dedent("""\
+        def f(a):
+          return a
+        x = f(1)
+        """)
+    expected_formatted_code = textwrap.dedent("""\
+        def f(a):
+            return a
+
+
+        x = f(1)
+        """)
+    uwlines = yapf_test_helper.ParseAndUnwrap(unformatted_code)
+    self.assertCodeEqual(expected_formatted_code,
+                         reformatter.Reformat(uwlines, verify=True))
+
+  def testVerifyModuleLocalizesError(self):
+    with self.assertRaises(verifier.InternalError):
+      verifier.VerifyModule('x = 1\nx = = 2\n', ['x = 1\n', 'x = = 2\n'])
+
+  def testVerifyEquivalence(self):
+    verifier.VerifyEquivalence('x = (1 +\n     2)\n', 'x = 1 + 2\n')
+    with self.assertRaises(verifier.InternalError):
+      verifier.VerifyEquivalence('import a, b\n', 'import a\nimport b\n')
+
+  def testVerifyEquivalenceIgnoresUnparsableOriginal(self):
+    verifier.VerifyEquivalence('print "hello"\n', 'print "hello"\n')
+
+  def testVerifyEquivalenceReportsNodePaths(self):
+    with self.assertRaises(verifier.EquivalenceError) as context:
+      verifier.VerifyEquivalence('x = 1\ny = f(a)\n', 'x = 1\ny = f(b)\n')
+    self.assertEqual(['Module.body[1].value.args[0].id'],
+                     context.exception.paths)
+
+  def testVerifyEquivalenceIgnoresDocStringWhitespace(self):
+    verifier.VerifyEquivalence('def f():\n  """  Doc.\n     More."""\n',
+                               'def f():\n  """Doc.\n  More.\n  """\n')
+
+  def testVerifyEquivalenceNormalizesImports(self):
+    original_code = textwrap.dedent("""\
+        import a, b
+        \"\"\"Copyright.\"\"\"
+        x = 1
+        import c
+        """)
+    reformatted_code = textwrap.dedent("""\
+        \"\"\"Copyright.\"\"\"
+        import a
+        import b
+        import c
+        x = 1
+        """)
+    with self.assertRaises(verifier.EquivalenceError):
+      verifier.VerifyEquivalence(original_code, reformatted_code)
+    with self.assertRaises(verifier.EquivalenceError):
+      verifier.VerifyEquivalence(
+          original_code, reformatted_code, split_imports=True)
+    verifier.VerifyEquivalence(
+        original_code, reformatted_code, split_imports=True, hoist_imports=True)
+
+  def testVerifyEquivalenceNormalizesImportOrder(self):
+    original_code = textwrap.dedent("""\
+        import b
+        from a import c
+        x = 1
+        import e
+        import d
+        """)
+    reformatted_code = textwrap.dedent("""\
+        from a import c
+        import b
+        x = 1
+        import d
+        import e
+        """)
+    with self.assertRaises(verifier.EquivalenceError):
+      verifier.VerifyEquivalence(original_code, reformatted_code)
+    verifier.VerifyEquivalence(
+        original_code, reformatted_code, sort_imports=True)
+    with self.assertRaises(verifier.EquivalenceError):
+      # the imports are not moved across other statements
+      verifier.VerifyEquivalence(
+          original_code, 'import b\nfrom a import c\nimport d\nx = 1\n'
+          'import e\n', sort_imports=True)
+
+
 if __name__ == '__main__':
   unittest.main()
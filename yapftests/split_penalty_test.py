@@ -19,6 +19,7 @@ import unittest
 
 from lib2to3 import pytree
 
+from yapf.yapflib import line_ranges
 from yapf.yapflib import pytree_utils
 from yapf.yapflib import pytree_visitor
 from yapf.yapflib import split_penalty
@@ -38,19 +39,20 @@ class SplitPenaltyTest(yapf_test_helper.YAPFTest):
   def setUpClass(cls):
     style.SetGlobalStyle(style.CreateChromiumStyle())
 
-  def _ParseAndComputePenalties(self, code, dumptree=False):
+  def _ParseAndComputePenalties(self, code, dumptree=False, lines=None):
     """Parses the code and computes split penalties.
 
     Arguments:
       code: code to parse as a string
       dumptree: if True, the parsed pytree (after penalty assignment) is dumped
         to stderr. Useful for debugging.
+      lines: (line_ranges.LineRanges) The lines which can be modified.
 
     Returns:
       Parse tree.
     """
     tree = pytree_utils.ParseCodeToTree(code)
-    split_penalty.ComputeSplitPenalties(tree)
+    split_penalty.ComputeSplitPenalties(tree, lines)
     if dumptree:
       pytree_visitor.DumpPyTree(tree, target_stream=sys.stderr)
     return tree
@@ -261,6 +263,28 @@ class SplitPenaltyTest(yapf_test_helper.YAPFTest):
         (')', VERY_STRONGLY_CONNECTED),
     ])
 
+  def testStatementsOutsideOfLines(self):
+    code = textwrap.dedent("""\
+        foo(1, 2)
+        bar(3, 4)
+        """)
+    tree = self._ParseAndComputePenalties(
+        code, lines=line_ranges.LineRanges([(2, 2)]))
+    self._CheckPenalties(tree, [
+        ('foo', None),
+        ('(', None),
+        ('1', None),
+        (',', None),
+        ('2', None),
+        (')', None),
+        ('bar', None),
+        ('(', UNBREAKABLE),
+        ('3', None),
+        (',', UNBREAKABLE),
+        ('4', None),
+        (')', VERY_STRONGLY_CONNECTED),
+    ])
+
 
 if __name__ == '__main__':
   unittest.main()
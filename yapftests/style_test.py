@@ -57,6 +57,8 @@ class UtilsTest(unittest.TestCase):
     self.assertEqual(style._StringListConverter('  foo'), ['foo'])
     self.assertEqual(
         style._StringListConverter('joe  ,foo,  bar'), ['joe', 'foo', 'bar'])
+    self.assertEqual(style._StringListConverter('"foo, bar"'), ['foo', 'bar'])
+    self.assertEqual(style._StringListConverter("'foo, bar"), ["'foo", 'bar'])
 
   def testBoolConverter(self):
     self.assertEqual(style._BoolConverter('true'), True)
@@ -233,6 +235,11 @@ class StyleFromFileTest(unittest.TestCase):
       self.assertTrue(_LooksLikeChromiumStyle(cfg))
       self.assertEqual(cfg['I18N_FUNCTION_CALL'], ['N_', 'V_', 'T_'])
 
+  def testQuotedStringListOptionValue(self):
+    cfg = style.CreateStyleFromConfig(
+        '{based_on_style: pep8, first_party_modules: "yapf, yapftests"}')
+    self.assertEqual(cfg['FIRST_PARTY_MODULES'], ['yapf', 'yapftests'])
+
   def testErrorNoStyleFile(self):
     with self.assertRaisesRegexp(style.StyleConfigError,
                                  'is not a valid style or file path'):
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Function: Tests for yapf.unified_diff
+Copyright Information: Huawei Technologies Co., Ltd. All Rights Reserved © 2010-2020
+Change History: 2026-10-18 Created
+"""
+
+import difflib
+import unittest
+
+from yapf.yapflib import unified_diff
+
+
+def _Patch(before, after):
+  """ Rebuild after from before and the opcodes of the diff."""
+  lines = []
+  for tag, i1, i2, j1, j2 in unified_diff._Opcodes(before, after):
+    if tag == 'equal':
+      lines.extend(before[i1:i2])
+    else:
+      lines.extend(after[j1:j2])
+  return lines
+
+
+class UnifiedDiffTest(unittest.TestCase):
+
+  def assertSameAsDifflib(self, before, after):
+    expected = list(
+        difflib.unified_diff(
+            before,
+            after,
+            'a.py',
+            'a.py',
+            '(original)',
+            '(reformatted)',
+            lineterm=''))
+    actual = list(
+        unified_diff.UnifiedDiff(before, after, 'a.py', 'a.py', '(original)',
+                                 '(reformatted)'))
+    self.assertEqual(expected, actual)
+
+  def testUnchanged(self):
+    lines = ['x = 1', 'y = 2']
+    self.assertEqual([], list(unified_diff.UnifiedDiff(lines, lines)))
+    self.assertEqual([], list(unified_diff.UnifiedDiff([], [])))
+
+  def testSameAsDifflib(self):
+    before = [
+        'import os', '', '', 'def f( a ):', '  return a', '', 'x=1', 'y = 2',
+        'z = 3', 'w = 4', 'v = 5', 'u = 6', 'print( x )'
+    ]
+    after = [
+        'import os', '', '', 'def f(a):', '    return a', '', '', 'x = 1',
+        'y = 2', 'z = 3', 'w = 4', 'v = 5', 'u = 6', 'print(x)'
+    ]
+    self.assertSameAsDifflib(before, after)
+    self.assertSameAsDifflib(after, before)
+    self.assertSameAsDifflib([], after)
+    self.assertSameAsDifflib(before, [])
+
+  def testHunks(self):
+    before = ['line %d' % i for i in range(100)]
+    after = list(before)
+    after[10] = 'changed 10'
+    after[50:52] = ['changed 50']
+    after.insert(90, 'inserted')
+    diff = list(unified_diff.UnifiedDiff(before, after))
+    self.assertEqual(
+        ['@@ -8,7 +8,7 @@', '@@ -48,8 +48,7 @@', '@@ -89,6 +88,7 @@'],
+        [line for line in diff if line.startswith('@@')])
+    self.assertSameAsDifflib(before, after)
+
+  def testRepeatedLines(self):
+    before = ['a', 'b', '', 'a', 'b', '', 'c', 'a']
+    after = ['a', '', 'b', 'a', 'c', '', 'a', 'b']
+    self.assertEqual(after, _Patch(before, after))
+    self.assertEqual(before, _Patch(after, before))
+
+  def testMovedLines(self):
+    before = ['import sys', 'import os', 'x = 1', 'y = 2']
+    after = ['import os', 'import sys', 'x = 1', 'y = 2']
+    self.assertEqual(after, _Patch(before, after))
+    self.assertSameAsDifflib(before, after)
+
+
+if __name__ == '__main__':
+  unittest.main()
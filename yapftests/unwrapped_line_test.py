@@ -80,6 +80,22 @@ class UnwrappedLineFormattingInformationTest(yapf_test_helper.YAPFTest):
     self.assertFalse(lparen.must_break_before)
     self.assertEqual(lparen.split_penalty, split_penalty.UNBREAKABLE)
 
+  def testUnformattedInformation(self):
+    code = textwrap.dedent(r"""
+        x = f(a,  b)  # trailing
+        """)
+    uwline = yapf_test_helper.ParseAndUnwrap(code)[0]
+    formatted = [(tok.spaces_required_before, tok.total_length)
+                 for tok in uwline.tokens]
+
+    uwline.CalculateUnformattedInformation()
+    self.assertEqual(formatted, [(tok.spaces_required_before, tok.total_length)
+                                 for tok in uwline.tokens])
+    self.assertEqual(1, uwline.first.spaces_required_before)
+    self.assertFalse(any(tok.must_break_before for tok in uwline.tokens))
+    self.assertFalse(any(tok.can_break_before for tok in uwline.tokens))
+
+
 
 def _MakeFormatTokenLeaf(token_type, token_value):
   return format_token.FormatToken(pytree.Leaf(token_type, token_value))
@@ -15,6 +15,7 @@
 """Tests for yapf.yapf."""
 
 import io
+import json
 import logging
 import os
 import shutil
@@ -67,6 +68,53 @@ class FormatCodeTest(yapf_test_helper.YAPFTest):
     expected_formatted_code = textwrap.dedent("""a.print\n""")
     self._Check(unformatted_code, expected_formatted_code)
 
+  def testOutput(self):
+    unformatted_code = textwrap.dedent("""\
+        a = 1 # one
+        bb = 2 # two
+
+        # comment
+        def f(): pass
+        c = 3
+        """)
+    formatted_code, changed = yapf_api.FormatCode(
+        unformatted_code, style_config='chromium')
+
+    chunks = []
+    code, streamed_changed = yapf_api.FormatCode(
+        unformatted_code, style_config='chromium', output=chunks.append)
+    self.assertIsNone(code)
+    self.assertEqual(changed, streamed_changed)
+    self.assertGreater(len(chunks), 1)
+    self.assertCodeEqual(formatted_code, ''.join(chunks))
+
+    chunks = []
+    _, changed = yapf_api.FormatCode(
+        formatted_code, style_config='chromium', output=chunks.append)
+    self.assertFalse(changed)
+    self.assertCodeEqual(formatted_code, ''.join(chunks))
+
+  def testCheck(self):
+    unformatted_code = textwrap.dedent("""\
+        a = 1
+
+
+        def f(): pass
+        """)
+    code, changed = yapf_api.FormatCode(
+        unformatted_code, style_config='chromium', check=True)
+    self.assertIsNone(code)
+    self.assertTrue(changed)
+
+    formatted_code, _ = yapf_api.FormatCode(
+        unformatted_code, style_config='chromium')
+    _, changed = yapf_api.FormatCode(
+        formatted_code, style_config='chromium', check=True)
+    self.assertFalse(changed)
+
+    with self.assertRaises(ValueError):
+      yapf_api.FormatCode(unformatted_code, print_diff=True, check=True)
+
 
 class FormatFileTest(unittest.TestCase):
 
@@ -379,6 +427,28 @@ class FormatFileTest(unittest.TestCase):
           filepath, style_config='chromium')
       self.assertCodeEqual(code, formatted_code)
 
+  def testOutputCRLFLineEnding(self):
+    code = u'class _():\r\n  pass\r\n\r\n\r\nx = 1\r\n'
+    chunks = []
+    with utils.TempFileContents(self.test_tmpdir, code) as filepath:
+      formatted_code, _, _ = yapf_api.FormatFile(
+          filepath, style_config='chromium', output=chunks.append)
+    self.assertIsNone(formatted_code)
+    self.assertCodeEqual(code, ''.join(chunks))
+
+  def testInPlaceCRLFLineEnding(self):
+    code = u'class _():\r\n  pass\r\n'
+    with utils.TempFileContents(self.test_tmpdir, code) as filepath:
+      os.utime(filepath, (0, 0))
+      yapf_api.FormatFile(filepath, style_config='chromium', in_place=True)
+      self.assertEqual(0, os.stat(filepath).st_mtime)
+
+      with io.open(filepath, mode='w', newline='') as fd:
+        fd.write(u'class _():\r\n    pass\r\n')
+      yapf_api.FormatFile(filepath, style_config='chromium', in_place=True)
+      with io.open(filepath, mode='r', newline='') as fd:
+        self.assertEqual(code, fd.read())
+
 
 class CommandLineTest(unittest.TestCase):
   """Test how calling yapf from the command line acts."""
@@ -503,6 +573,83 @@ class CommandLineTest(unittest.TestCase):
         expected_formatted_code,
         extra_options=['--style=chromium'])
 
+  def testCheckEquivalence(self):
+    unformatted_code = textwrap.dedent("""\
+        def foo(a, b): # trail
+            return (a +
+                    b)
+        """)
+    expected_formatted_code = textwrap.dedent("""\
+        def foo(a, b):  # trail
+            return (a + b)
+        """)
+    self.assertYapfReformats(
+        unformatted_code,
+        expected_formatted_code,
+        extra_options=['--check-equivalence'])
+
+  def testLintOnly(self):
+    unformatted_code = textwrap.dedent("""\
+        class bad_name: pass
+        """)
+    p = subprocess.Popen(
+        YAPF_BINARY + ['--lint-only', '--style=huawei'],
+        stdout=subprocess.PIPE,
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE)
+    stdoutdata, stderrdata = p.communicate(unformatted_code.encode('utf-8'))
+    self.assertEqual(p.returncode, 1)
+    self.assertEqual(stdoutdata, b'')
+    self.assertIn(b'Invalid class name: bad_name', stderrdata)
+
+  def testCheck(self):
+    unformatted_code = u'def foo(): pass\n'
+    formatted_code = u'def foo():\n    pass\n'
+    for code, returncode in ((unformatted_code, 1), (formatted_code, 0)):
+      with utils.TempFileContents(
+          self.test_tmpdir, code, suffix='.py') as filepath:
+        p = subprocess.Popen(
+            YAPF_BINARY + ['--check', filepath], stdout=subprocess.PIPE)
+        stdoutdata, _ = p.communicate()
+        self.assertEqual(p.returncode, returncode)
+        self.assertEqual(stdoutdata, b'')
+        with io.open(filepath, mode='r', newline='') as fd:
+          self.assertEqual(code, fd.read())
+
+  def testWarningsReportFormat(self):
+    unformatted_code = textwrap.dedent("""\
+        class bad_name: pass
+        class other_name: pass
+        """)
+    p = subprocess.Popen(
+        YAPF_BINARY +
+        ['--lint-only', '--style=huawei', '--warnings-format=summary'],
+        stdout=subprocess.PIPE,
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE)
+    _, stderrdata = p.communicate(unformatted_code.encode('utf-8'))
+    self.assertEqual(
+        json.loads(stderrdata.decode('utf-8'))['CLASS_NAMING_STYLE'], 2)
+
+  def testLowMemory(self):
+    unformatted_code = textwrap.dedent("""\
+        '''Docstring.'''
+        def foo(a, b): # trail
+            return (a +
+                    b)
+        """)
+    expected_formatted_code = textwrap.dedent("""\
+        '''Docstring.'''
+
+
+        def foo(a, b):  # trail
+            return (a + b)
+        """)
+    self.assertYapfReformats(
+        unformatted_code,
+        expected_formatted_code,
+        extra_options=['--low-memory'])
+
   def testSetCustomStyleBasedOnChromium(self):
     unformatted_code = textwrap.dedent("""\
         def foo(): # trail